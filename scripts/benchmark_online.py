@@ -0,0 +1,81 @@
+"""
+Latency benchmark and offline check for OnlineSITAnalyzer.
+
+A synthetic session is streamed in batches of several sizes, both as fresh
+arrays and through one reused buffer, as a live feed does; the per-batch
+push latency is reported and the final snapshot is compared with the offline
+SITAnalyzer methods on the same frames.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from sit_analysis.analyzer import SITAnalyzer
+from sit_analysis.online import OnlineSITAnalyzer
+
+ARENA = [(40.0, 30.0), (40.0, 430.0), (440.0, 430.0), (440.0, 30.0)]
+SIZ = [(140.0, 30.0), (140.0, 150.0), (340.0, 150.0), (340.0, 30.0)]
+
+
+def synthetic_session(n_frames: int, seed: int = 0) -> np.ndarray:
+    """Random walk inside the arena, shape (n_frames, 2)."""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 3, (n_frames, 2))
+    walk = np.cumsum(steps, axis=0) + [240.0, 230.0]
+    return np.clip(walk, [41.0, 31.0], [439.0, 429.0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OnlineSITAnalyzer")
+    parser.add_argument("--frames", type=int, default=30 * 60 * 10)
+    parser.add_argument("--batch_sizes", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--px_size", type=float, default=0.1)
+    args = parser.parse_args()
+
+    center = synthetic_session(args.frames, seed=0)
+    nose = center + np.random.default_rng(1).normal(0, 2, center.shape)
+
+    sit = SITAnalyzer(ARENA, SIZ, fps=args.fps)
+    _, normalized = sit.distance_to_poi(pd.DataFrame(nose))
+    offline = {
+        "time_in_siz": sit.time_in_SIZ(pd.DataFrame(center)),
+        "normalized_distance_to_poi": normalized.mean(),
+        "total_distance": sit.total_distance_traveled(pd.DataFrame(center), args.px_size),
+    }
+
+    failed = False
+    for batch_size, reuse in [(b, r) for b in args.batch_sizes for r in (False, True)]:
+        online = OnlineSITAnalyzer(ARENA, SIZ, fps=args.fps, px_size=args.px_size)
+        center_buffer, nose_buffer = np.empty((batch_size, 2)), np.empty((batch_size, 2))
+        latencies = []
+        for start in range(0, args.frames, batch_size):
+            batch_center, batch_nose = center[start:start + batch_size], nose[start:start + batch_size]
+            if reuse:
+                # Overwrite the same buffer every batch, like a camera frame grabber
+                n = len(batch_center)
+                center_buffer[:n], nose_buffer[:n] = batch_center, batch_nose
+                batch_center, batch_nose = center_buffer[:n], nose_buffer[:n]
+            t0 = time.perf_counter()
+            online.push(batch_center, batch_nose)
+            latencies.append(time.perf_counter() - t0)
+
+        latencies = np.array(latencies) * 1e6
+        snapshot = online.snapshot()
+        errors = {k: abs(snapshot[k] - v) for k, v in offline.items()}
+        ok = all(np.isclose(snapshot[k], v, rtol=1e-9, atol=1e-9) for k, v in offline.items())
+        failed |= not ok
+
+        print(f"batch {batch_size:5d} {'reused' if reuse else 'fresh ':6s}: median {np.median(latencies):8.1f} us, "
+              f"p99 {np.percentile(latencies, 99):8.1f} us, "
+              f"{np.median(latencies) / batch_size:6.2f} us/frame, "
+              f"max abs error {max(errors.values()):.2e} {'ok' if ok else 'MISMATCH'}")
+
+    if failed:
+        raise SystemExit("Online results differ from the offline SITAnalyzer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Startup-time guard for the SIT analysis package.
+
+Each case runs in a fresh interpreter, is timed, and fails if it exceeds its
+budget or imports one of the heavy dependencies (deepof, matplotlib, scipy,
+tensorflow) that must only load when a DeepOF project is opened.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("deepof", "matplotlib", "scipy", "tensorflow")
+
+CHECK_MODULES = (
+    "import sys\n{imports}\n"
+    "heavy = [m for m in {heavy!r} if m in sys.modules]\n"
+    "print('HEAVY:' + ','.join(heavy))"
+)
+
+RUN_HELP = (
+    "import runpy\n"
+    "sys.argv = [{script!r}, '--help']\n"
+    "try:\n"
+    "    runpy.run_path({script!r}, run_name='__main__')\n"
+    "except SystemExit:\n"
+    "    pass"
+)
+RUN_ANALYSIS = os.path.join(REPO_ROOT, "scripts", "run_analysis.py")
+
+# name -> (command, budget in seconds, imports checked for heavy modules)
+CASES: Dict[str, Tuple[List[str], float, str]] = {
+    "import sit_analysis": (
+        [sys.executable, "-c", "import sit_analysis"], 1.0,
+        "import sit_analysis",
+    ),
+    "import sit_analysis.kernels": (
+        [sys.executable, "-c", "import sit_analysis.kernels"], 1.0,
+        "import sit_analysis.kernels, sit_analysis.locomotion, sit_analysis.occupancy",
+    ),
+    "import sit_analysis.analyzer": (
+        [sys.executable, "-c", "import sit_analysis.analyzer"], 2.0,
+        "import sit_analysis.analyzer",
+    ),
+    "run_analysis.py --help": (
+        [sys.executable, RUN_ANALYSIS, "--help"], 1.0,
+        RUN_HELP.format(script=RUN_ANALYSIS),
+    ),
+}
+
+
+def time_command(command: List[str], repeats: int) -> float:
+    """Median wall-clock time of a command run in a fresh process."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def heavy_imports(imports: str) -> List[str]:
+    """Heavy modules present in sys.modules after the given imports."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    code = CHECK_MODULES.format(imports=imports, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    marker = [line for line in output.splitlines() if line.startswith("HEAVY:")][-1]
+    return [m for m in marker[len("HEAVY:"):].split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure package startup time")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiply every budget, e.g. on slow machines")
+    args = parser.parse_args()
+
+    baseline = time_command([sys.executable, "-c", "pass"], args.repeats)
+    print(f"{'interpreter baseline':32s} {baseline * 1000:8.1f} ms")
+
+    failures = []
+    for name, (command, budget, imports) in CASES.items():
+        elapsed = time_command(command, args.repeats)
+        heavy = heavy_imports(imports)
+        status = "ok"
+        if elapsed > budget * args.scale:
+            status = f"SLOW (budget {budget * args.scale * 1000:.0f} ms)"
+        if heavy:
+            status = f"HEAVY IMPORTS: {', '.join(heavy)}"
+        if status != "ok":
+            failures.append(name)
+        print(f"{name:32s} {elapsed * 1000:8.1f} ms  {status}")
+
+    if failures:
+        sys.exit(f"Startup regressions: {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ CLI version to run Social Interaction Analysis
 @author: @madmaxpython
 """
 import argparse
-from sit_analysis.analyzer import Experience
+import os
 
 def main():
     parser = argparse.ArgumentParser(description="Run SIT analysis")
@@ -18,8 +18,29 @@ def main():
     parser.add_argument("--fps", type=float, default=30)
     parser.add_argument("--px_size", type=float, default=1.0)
     parser.add_argument("--output", required=True)
+    parser.add_argument("--fused", action="store_true",
+                        help="Use the single-pass NumPy kernel")
+    parser.add_argument("--likelihood_threshold", type=float, default=None,
+                        help="Mask points below this detection likelihood (with --fused)")
+    parser.add_argument("--max_gap", type=int, default=None,
+                        help="Longest run of missing frames to interpolate (with --fused)")
+    parser.add_argument("--occupancy_bins", type=int, default=None,
+                        help="Also save Center occupancy maps on this grid size next to the output")
+    parser.add_argument("--speed_window", type=float, default=1.0,
+                        help="Speed smoothing window in seconds")
+    parser.add_argument("--immobility_speed", type=float, default=2.0,
+                        help="Speed (cm/s) under which the animal is immobile")
+    parser.add_argument("--min_immobility_bout", type=float, default=1.0,
+                        help="Shortest immobile stretch (s) counted as a bout")
+    parser.add_argument("--distance_field", action="store_true",
+                        help="Also report distance to the SIZ boundary and arena edge")
+    parser.add_argument("--field_resolution", type=float, default=1.0,
+                        help="Distance field cell size in pixels")
     args = parser.parse_args()
 
+    # Imported after parsing so --help stays fast
+    from sit_analysis.analyzer import Experience
+
     analyzer = Experience(
         project_path=args.project_path,
         conditions_path=args.conditions_path,
@@ -27,11 +48,25 @@ def main():
         SIZ_path=args.siz_path,
         fps=args.fps,
         PX_SIZE=args.px_size,
+        fused=args.fused,
+        likelihood_threshold=args.likelihood_threshold,
+        max_gap=args.max_gap,
+        occupancy_bins=args.occupancy_bins,
+        speed_window=args.speed_window,
+        immobility_speed=args.immobility_speed,
+        min_immobility_bout=args.min_immobility_bout,
+        distance_field=args.distance_field,
+        field_resolution=args.field_resolution,
     )
 
     results_df = analyzer.run_all()
     results_df.to_csv(args.output, index=False, encoding="utf-8-sig")
     print(f"Saved results to {args.output}")
 
+    if args.occupancy_bins:
+        occupancy_path = os.path.splitext(args.output)[0] + "_occupancy.npz"
+        analyzer.save_occupancy(occupancy_path)
+        print(f"Saved occupancy maps to {occupancy_path}")
+
 if __name__ == "__main__":
     main()
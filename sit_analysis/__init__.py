@@ -1 +1,15 @@
-from .analyzer import Experience, SITAnalyzer
\ No newline at end of file
+# Submodules are imported lazily so that `import sit_analysis.kernels` and
+# friends only pay for NumPy, not pandas/matplotlib/deepof.
+_EXPORTS = {
+    "Experience": "analyzer",
+    "SITAnalyzer": "analyzer",
+    "OnlineSITAnalyzer": "online",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        from importlib import import_module
+        return getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
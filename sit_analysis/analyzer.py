@@ -1,8 +1,13 @@
+from collections import Counter, OrderedDict
 from typing import Dict, List, Tuple, Any, Optional
 import numpy as np
 import pandas as pd
-import matplotlib.path as mpath
-from data_loader import read_tuples_file, load_deepof_project, match_params_to_videos
+from .data_loader import read_tuples_file, load_deepof_project, match_params_to_videos, parse_video_name
+from .kernels import fused_sit_metrics
+from .occupancy import OccupancyAccumulator
+from .locomotion import locomotion_profile, step_lengths
+from .distance_field import DistanceField, PolygonDistance, ZoneDistance, build_distance_fields, exact_distances
+from .results import ResultAccumulator
 
 class SITAnalyzer:
     """
@@ -40,11 +45,31 @@ class SITAnalyzer:
             self.top_right_SIZ,
             self.top_left_SIZ
         ])
-        self.siz_path: mpath.Path = mpath.Path(self.siz_vertices)
+        self._siz_path: Any = None
+
+        # Arena polygon, in the same order as the SIZ
+        self.arena_vertices: np.ndarray = np.array([
+            self.bottom_left_arena,
+            self.bottom_right_arena,
+            self.top_right_arena,
+            self.top_left_arena
+        ])
 
         # Define point of interest (POI): top-center of the arena
         self.POI: np.ndarray = np.mean([self.top_left_arena, self.top_right_arena], axis=0)
 
+    @property
+    def siz_path(self) -> Any:
+        """
+        matplotlib Path of the SIZ, used by the reference ``time_in_SIZ``.
+
+        matplotlib is imported on first use so the NumPy engine stays light.
+        """
+        if self._siz_path is None:
+            import matplotlib.path as mpath
+            self._siz_path = mpath.Path(self.siz_vertices)
+        return self._siz_path
+
     def distance_to_poi(self,
         body_part: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
         """
@@ -123,6 +148,170 @@ class SITAnalyzer:
 
         return float(np.sum(in_zone)) / self.FPS
 
+    def distance_fields(
+        self,
+        resolution: float = 1.0,
+        include_poi: bool = True,
+        dtype: Any = np.float64) -> Dict[str, DistanceField]:
+        """
+        Precompute distance fields of this geometry for fast per-frame lookups.
+
+        Parameters
+        ----------
+        resolution : float, optional
+            Grid cell size in pixels. Default is 1.
+        include_poi : bool, optional
+            Also build the ``"poi"`` field, which approximates
+            ``distance_to_poi``. Default is True.
+        dtype : numpy dtype, optional
+            Storage type of the grids. Default is float64.
+
+        Returns
+        -------
+        dict
+            ``"siz"`` and ``"arena"`` signed fields (negative inside) and,
+            with ``include_poi``, the ``"poi"`` field.
+        """
+        return build_distance_fields(
+            self.arena_vertices, self.siz_vertices,
+            poi=self.POI if include_poi else None,
+            resolution=resolution,
+            dtype=dtype,
+        )
+
+    def exact_distances(self) -> Dict[str, PolygonDistance]:
+        """
+        Exact SIZ and arena-edge distances of this geometry, without a grid.
+
+        Returns
+        -------
+        dict
+            ``"siz"`` and ``"arena"`` signed distances (negative inside),
+            usable wherever ``distance_fields`` is.
+        """
+        return exact_distances(self.arena_vertices, self.siz_vertices)
+
+    def zone_distances(
+        self,
+        body_part: pd.DataFrame,
+        fields: Dict[str, ZoneDistance]) -> Tuple[pd.Series, pd.Series]:
+        """
+        Look up the distance of a body part to the SIZ boundary and arena edge.
+
+        Parameters
+        ----------
+        body_part : pd.DataFrame
+            DataFrame of shape (n_frames, 2) with [x, y] coordinates.
+        fields : dict
+            Distances from ``distance_fields`` or ``exact_distances``.
+
+        Returns
+        -------
+        tuple of pd.Series
+            Signed distance to the SIZ boundary (negative inside the SIZ) and
+            distance to the arena edge (positive inside the arena), per frame.
+        """
+        if body_part.shape[1] != 2:
+            raise ValueError("body_part DataFrame must have two columns: x and y.")
+
+        points: np.ndarray = body_part.values
+        return (
+            pd.Series(fields["siz"].lookup(points), index=body_part.index),
+            pd.Series(-fields["arena"].lookup(points), index=body_part.index)
+        )
+
+    def locomotion(
+        self,
+        body_part: pd.DataFrame,
+        px_size: float,
+        speed_window: float = 1.0,
+        immobility_speed: float = 2.0,
+        min_immobility_bout: float = 1.0) -> Dict[str, float]:
+        """
+        Compute speed and immobility statistics of a body part.
+
+        Parameters
+        ----------
+        body_part : pd.DataFrame
+            DataFrame of shape (n_frames, 2) with [x, y] coordinates.
+        px_size : float
+            Physical size of one pixel (cm).
+        speed_window : float, optional
+            Length of the speed smoothing window in seconds. Default is 1.
+        immobility_speed : float, optional
+            Smoothed speed (cm/s) under which the animal is immobile. Default is 2.
+        min_immobility_bout : float, optional
+            Shortest immobile stretch (s) counted as a bout. Default is 1.
+
+        Returns
+        -------
+        dict
+            Mean/max speed (cm/s), time immobile (s) and immobility bout count.
+        """
+        if body_part.shape[1] != 2:
+            raise ValueError("body_part DataFrame must have two columns: x and y.")
+
+        return locomotion_profile(
+            step_lengths(body_part.values), px_size, self.FPS,
+            speed_window=speed_window,
+            immobility_speed=immobility_speed,
+            min_immobility_bout=min_immobility_bout,
+        )
+
+    def fused_metrics(
+        self,
+        center: np.ndarray,
+        nose: np.ndarray,
+        px_size: float,
+        center_likelihood: Optional[np.ndarray] = None,
+        nose_likelihood: Optional[np.ndarray] = None,
+        likelihood_threshold: Optional[float] = None,
+        max_gap: Optional[int] = None,
+        distance_fields: Optional[Dict[str, ZoneDistance]] = None,
+        **locomotion_params: float) -> Dict[str, float]:
+        """
+        Compute time in SIZ, POI distances, path length and locomotion in a single pass.
+
+        Parameters
+        ----------
+        center, nose : np.ndarray
+            Arrays of shape (n_frames, 2) with raw [x, y] coordinates.
+        px_size : float
+            Physical size of one pixel.
+        center_likelihood, nose_likelihood : np.ndarray, optional
+            Detection confidence of each body part per frame.
+        likelihood_threshold : float, optional
+            Points with a likelihood below this value are masked.
+        max_gap : int, optional
+            Longest run of missing frames to fill. Default (None) fills all.
+        distance_fields : dict, optional
+            ``"siz"`` and ``"arena"`` from ``distance_fields`` or
+            ``exact_distances``; adds ``distance_to_siz`` and
+            ``distance_to_arena_edge`` for the Center.
+        **locomotion_params
+            ``speed_window``, ``immobility_speed`` and ``min_immobility_bout``,
+            as in ``locomotion``.
+
+        Returns
+        -------
+        dict
+            Metrics as returned by ``kernels.fused_sit_metrics``.
+        """
+        return fused_sit_metrics(
+            center, nose,
+            siz_vertices=self.siz_vertices,
+            poi=self.POI,
+            max_dist=float(np.linalg.norm(self.POI - np.array(self.bottom_left_arena))),
+            fps=self.FPS,
+            px_size=px_size,
+            center_likelihood=center_likelihood,
+            nose_likelihood=nose_likelihood,
+            likelihood_threshold=likelihood_threshold,
+            max_gap=max_gap,
+            distance_fields=distance_fields,
+            **locomotion_params,
+        )
+
 
 
 
@@ -144,8 +333,39 @@ class Experience:
         Video frame rate in frames per second. Default is 30.
     PX_SIZE : float, optional
         Physical size of one pixel. Default is 0.1.
+    fused : bool, optional
+        Use the single-pass NumPy kernel instead of the pandas pipeline.
+        Default is False.
+    likelihood_threshold : float, optional
+        With ``fused``, mask points whose detection likelihood is below this
+        value. Default (None) keeps every point.
+    max_gap : int, optional
+        With ``fused``, longest run of missing frames to interpolate.
+        Default (None) fills all gaps.
+    occupancy_bins : int, optional
+        If given, accumulate Center occupancy maps on a grid of this many
+        cells per arena axis while animals are analyzed. Default is None.
+    speed_window : float, optional
+        Length of the speed smoothing window in seconds. Default is 1.
+    immobility_speed : float, optional
+        Smoothed speed (cm/s) under which the animal is immobile. Default is 2.
+    min_immobility_bout : float, optional
+        Shortest immobile stretch (s) counted as a bout. Default is 1.
+    distance_field : bool, optional
+        Also report Center distance to the SIZ boundary and arena edge.
+        Distances are exact, or looked up in precomputed distance fields for
+        a geometry shared by at least ``FIELD_MIN_REUSE`` videos. Default is
+        False.
+    field_resolution : float, optional
+        Distance field cell size in pixels. Default is 1.
     """
 
+    # Building a field costs about as much as five exact computations on a
+    # 15 min session, so fewer videos per geometry use exact distances
+    FIELD_MIN_REUSE: int = 5
+    # Distance fields of the last few video geometries kept in memory
+    FIELD_CACHE_SIZE: int = 4
+
     def __init__(
         self,
         project_path: str,
@@ -153,7 +373,16 @@ class Experience:
         arena_path: str,
         SIZ_path: str,
         fps: float = 30,
-        PX_SIZE: float = 0.1) -> None:
+        PX_SIZE: float = 0.1,
+        fused: bool = False,
+        likelihood_threshold: Optional[float] = None,
+        max_gap: Optional[int] = None,
+        occupancy_bins: Optional[int] = None,
+        speed_window: float = 1.0,
+        immobility_speed: float = 2.0,
+        min_immobility_bout: float = 1.0,
+        distance_field: bool = False,
+        field_resolution: float = 1.0) -> None:
 
         self.project: Any = load_deepof_project(project_path, conditions_path)
         self.arena_params: Any = read_tuples_file(arena_path)
@@ -161,11 +390,29 @@ class Experience:
 
         self.pixel_size: float = PX_SIZE
         self.fps: float = fps
+        self.fused: bool = fused
+        self.likelihood_threshold: Optional[float] = likelihood_threshold
+        self.max_gap: Optional[int] = max_gap
+        self.occupancy: Optional[OccupancyAccumulator] = (
+            OccupancyAccumulator(occupancy_bins) if occupancy_bins else None
+        )
+        self.locomotion_params: Dict[str, float] = {
+            "speed_window": speed_window,
+            "immobility_speed": immobility_speed,
+            "min_immobility_bout": min_immobility_bout,
+        }
+        self.distance_field: bool = distance_field
+        self.field_resolution: float = field_resolution
+        self._fields: "OrderedDict[Tuple, Dict[str, DistanceField]]" = OrderedDict()
+        self.missing_sessions: Optional[pd.DataFrame] = None
 
         # Map each video name to its arena and SIZ coordinates
         self.arena_map, self.siz_map = match_params_to_videos(
             self.project._videos, self.arena_params, self.siz_params
         )
+        self._geometry_uses: Counter = Counter(
+            self._geometry(name) for name in self.arena_map if name in self.siz_map
+        )
 
     @staticmethod
     def _interpolate(df: pd.DataFrame) -> pd.DataFrame:
@@ -184,6 +431,101 @@ class Experience:
         """
         return df.interpolate() if df.isnull().any().any() else df
 
+    def _likelihood(self, animal_name: str, body_part: str) -> Optional[np.ndarray]:
+        """
+        Fetch the per-frame detection likelihood of one body part.
+
+        Parameters
+        ----------
+        animal_name : str
+            Video filename or key in project tables.
+        body_part : str
+            Body part name, e.g. "Center".
+
+        Returns
+        -------
+        np.ndarray or None
+            Likelihood per frame, or None if the project has no quality data.
+        """
+        quality = getattr(self.project, "_quality", None)
+        if not quality or animal_name not in quality:
+            return None
+        if body_part not in quality[animal_name]:
+            return None
+        return quality[animal_name][body_part].to_numpy(dtype=float)
+
+    def _geometry(self, animal_name: str) -> Tuple:
+        """Hashable arena and SIZ corners of a video."""
+        return tuple(map(tuple, self.arena_map[animal_name])), tuple(map(tuple, self.siz_map[animal_name]))
+
+    def _distance_fields(self, animal_name: str, sit: SITAnalyzer) -> Dict[str, ZoneDistance]:
+        """
+        SIZ and arena distances of a video's geometry.
+
+        Each video usually has its own corners, so distances are exact unless
+        at least ``FIELD_MIN_REUSE`` videos share the geometry. Only then are
+        distance fields built; they are stored as float32 and only the last
+        ``FIELD_CACHE_SIZE`` geometries are kept.
+
+        Parameters
+        ----------
+        animal_name : str
+            Video filename or key in project tables.
+        sit : SITAnalyzer
+            Analyzer built from this video's arena and SIZ.
+
+        Returns
+        -------
+        dict
+            ``"siz"`` and ``"arena"`` distances.
+        """
+        key = self._geometry(animal_name)
+        if self._geometry_uses[key] < self.FIELD_MIN_REUSE:
+            return sit.exact_distances()
+        if key in self._fields:
+            self._fields.move_to_end(key)
+            return self._fields[key]
+
+        fields = sit.distance_fields(self.field_resolution, include_poi=False, dtype=np.float32)
+        self._fields[key] = fields
+        if len(self._fields) > self.FIELD_CACHE_SIZE:
+            self._fields.popitem(last=False)
+        return fields
+
+    def _group(self, animal_name: str, session: str) -> str:
+        """
+        Occupancy group of a video: its CSDS condition and SIT session.
+
+        Parameters
+        ----------
+        animal_name : str
+            Video filename or key in project tables.
+        session : str
+            SIT session number.
+
+        Returns
+        -------
+        str
+            Group label such as "Control_Session1".
+        """
+        conditions = getattr(self.project, "_exp_conditions", None) or {}
+        if animal_name in conditions and "CSDS" in conditions[animal_name]:
+            return f"{conditions[animal_name]['CSDS'].iloc[0]}_Session{session}"
+        return f"Session{session}"
+
+    def save_occupancy(self, path: str) -> None:
+        """
+        Save the accumulated occupancy maps to a compressed ``.npz`` file.
+
+        Parameters
+        ----------
+        path : str
+            Output file path.
+        """
+        if self.occupancy is None:
+            raise ValueError("Occupancy was not enabled; pass occupancy_bins to Experience.")
+        self.occupancy.save(path)
+
     @staticmethod
     def results_to_df(results_dict: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
         """
@@ -199,46 +541,11 @@ class Experience:
         pd.DataFrame
             DataFrame indexed by Animal_ID, with SIZ and distance ratios added.
         """
-        df = pd.DataFrame.from_dict(results_dict, orient="index")
-
-        # Compute Social Interaction Ratios (SIR)
-        df["Time_SIR_typeA"] = (
-            df["Time_in_SIZ_Session2"] / df["Time_in_SIZ_Session1"]
-        )
-        df["Time_SIR_typeB"] = (
-            df["Time_in_SIZ_Session2"] /
-            (df["Time_in_SIZ_Session1"] + df["Time_in_SIZ_Session2"])
-        )
-        df["Distance_SIR_typeA"] = (
-            df["Normalized_distance_to_POI_Session2"] /
-            df["Normalized_distance_to_POI_Session1"]
-        )
-        df["Distance_SIR_typeB"] = (
-            df["Normalized_distance_to_POI_Session2"] /
-            (df["Normalized_distance_to_POI_Session1"] +
-             df["Normalized_distance_to_POI_Session2"])
-        )
-        df["Social_Engagement_Index"] = df["Time_SIR_typeB"] / df["Distance_SIR_typeA"]
-
-        # Reorder columns for readability
-        df = df.reindex(columns=[
-            "Animal_ID",
-            "Time_in_SIZ_Session1", "Time_in_SIZ_Session2",
-            "Normalized_distance_to_POI_Session1", "Normalized_distance_to_POI_Session2",
-            "Time_SIR_typeB","Distance_SIR_typeB", "Social_Engagement_Index",
-            "Time_SIR_typeA","Distance_SIR_typeA",
-            "Total_Distance_Traveled_Session1", "Total_Distance_Traveled_Session2",
-        ])
-
-        # Ensure numeric types where possible
-        for col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="ignore")
-
-        return df
+        return ResultAccumulator.from_results_dict(results_dict).to_frame()
 
-    def analyze_animal(self, animal_name: str) -> Optional[Dict[str, Any]]:
+    def session_metrics(self, animal_name: str) -> Optional[Tuple[str, int, Dict[str, float]]]:
         """
-        Compute metrics for one animal-video pairing.
+        Compute the metrics of one animal-video pairing.
 
         Parameters
         ----------
@@ -247,62 +554,135 @@ class Experience:
 
         Returns
         -------
-        dict or None
-            Metrics dict for this animal, or None if missing arena/SIZ.
+        tuple or None
+            (Animal_ID, session, metrics without session suffix), or None if
+            the name cannot be parsed or arena/SIZ are missing.
         """
-        base_name, session = animal_name.split("_SIT")[0], animal_name.split(".")[-1]
+        parsed = parse_video_name(animal_name)
+        if parsed is None:
+            print(f"{animal_name}: cannot parse '<animal>_SIT<...>.<session>', skipping")
+            return None
+        base_name, session = parsed
 
         if animal_name not in self.arena_map or animal_name not in self.siz_map:
             return None
 
         arena_coords = self.arena_map[animal_name]
         siz_coords = self.siz_map[animal_name]
-        sit = SITAnalyzer(arena_coords=arena_coords, siz_coords=siz_coords)
-
-        center = self._interpolate(
-            self.project._tables[animal_name][[("Center", "x"), ("Center", "y")]]
-        )
-        nose = self._interpolate(
-            self.project._tables[animal_name][[("Nose", "x"), ("Nose", "y")]]
-        )
+        sit = SITAnalyzer(arena_coords=arena_coords, siz_coords=siz_coords, fps=self.fps)
+        table = self.project._tables[animal_name]
+
+        if self.occupancy is not None:
+            self.occupancy.add(
+                animal_name,
+                self._group(animal_name, str(session)),
+                table[[("Center", "x"), ("Center", "y")]].to_numpy(dtype=float),
+                arena_coords,
+            )
+
+        fields = self._distance_fields(animal_name, sit) if self.distance_field else None
+
+        if self.fused:
+            metrics = sit.fused_metrics(
+                center=table[[("Center", "x"), ("Center", "y")]].to_numpy(dtype=float),
+                nose=table[[("Nose", "x"), ("Nose", "y")]].to_numpy(dtype=float),
+                px_size=self.pixel_size,
+                center_likelihood=self._likelihood(animal_name, "Center"),
+                nose_likelihood=self._likelihood(animal_name, "Nose"),
+                likelihood_threshold=self.likelihood_threshold,
+                max_gap=self.max_gap,
+                distance_fields=fields,
+                **self.locomotion_params,
+            )
+            data = {
+                "Time_in_SIZ": metrics["time_in_siz"],
+                "Normalized_distance_to_POI": metrics["normalized_distance_to_poi"],
+                "Distance_to_POI": metrics["distance_to_poi"],
+                "Total_Distance_Traveled": metrics["total_distance"],
+                "Mean_speed": metrics["mean_speed"],
+                "Max_speed": metrics["max_speed"],
+                "Time_immobile": metrics["time_immobile"],
+                "Immobility_bouts": metrics["immobility_bouts"],
+                "Masked_fraction": metrics["masked_fraction"],
+            }
+            if fields is not None:
+                data["Distance_to_SIZ"] = metrics["distance_to_siz"]
+                data["Distance_to_arena_edge"] = metrics["distance_to_arena_edge"]
+            return base_name, session, data
+
+        center = self._interpolate(table[[("Center", "x"), ("Center", "y")]])
+        nose = self._interpolate(table[[("Nose", "x"), ("Nose", "y")]])
 
         time_in_siz = sit.time_in_SIZ(center)
         dist_to_poi, norm_dist_to_poi = sit.distance_to_poi(nose)
         total_dist = sit.total_distance_traveled(center, self.pixel_size)
-
-        return {
-            "Animal_ID": base_name,
-            f"Time_in_SIZ_Session{session}": time_in_siz,
-            f"Normalized_distance_to_POI_Session{session}": norm_dist_to_poi.mean(),
-            f"Distance_to_POI_Session{session}": dist_to_poi.mean(),
-            f"Total_Distance_Traveled_Session{session}": total_dist,
+        locomotion = sit.locomotion(center, self.pixel_size, **self.locomotion_params)
+
+        data = {
+            "Time_in_SIZ": time_in_siz,
+            "Normalized_distance_to_POI": norm_dist_to_poi.mean(),
+            "Distance_to_POI": dist_to_poi.mean(),
+            "Total_Distance_Traveled": total_dist,
+            "Mean_speed": locomotion["mean_speed"],
+            "Max_speed": locomotion["max_speed"],
+            "Time_immobile": locomotion["time_immobile"],
+            "Immobility_bouts": locomotion["immobility_bouts"],
         }
+        if fields is not None:
+            dist_to_siz, dist_to_edge = sit.zone_distances(center, fields)
+            data["Distance_to_SIZ"] = dist_to_siz.mean()
+            data["Distance_to_arena_edge"] = dist_to_edge.mean()
+        return base_name, session, data
+
+    def analyze_animal(self, animal_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Compute metrics for one animal-video pairing.
+
+        Parameters
+        ----------
+        animal_name : str
+            Video filename or key in project tables.
+
+        Returns
+        -------
+        dict or None
+            Metrics dict for this animal, or None if missing arena/SIZ.
+        """
+        result = self.session_metrics(animal_name)
+        if result is None:
+            return None
+
+        base_name, session, metrics = result
+        data: Dict[str, Any] = {"Animal_ID": base_name}
+        data.update({f"{name}_Session{session}": value for name, value in metrics.items()})
+        return data
 
     def run_all(self) -> pd.DataFrame:
         """
         Analyze all animals in the project and compile results.
 
+        Skipped, duplicated and missing sessions are reported once at the
+        end; animals missing or skipping a session are also kept in
+        ``self.missing_sessions``.
+
         Returns
         -------
         pd.DataFrame
             Combined results for all animals, with SIR ratios appended.
         """
-        results: Dict[str, Dict[str, Any]] = {}
+        results = ResultAccumulator(capacity=max(len(self.project.get_exp_conditions), 1))
 
         for animal in self.project.get_exp_conditions:
-            data = self.analyze_animal(animal)
+            data = self.session_metrics(animal)
             if data is None:
                 continue
+            results.append(*data)
 
-            key = data["Animal_ID"]
-            if key not in results:
-                results[key] = {"Animal_ID": key}
-            else:
-                print(f"{key} already analyzed, updating metrics")
+        df = results.to_frame()
+        self.missing_sessions = results.missing
 
-            # Merge new session metrics
-            results[key].update({
-                k: v for k, v in data.items() if k != "Animal_ID"
-            })
+        summary = results.report()
+        if summary:
+            print(summary)
 
-        return self.results_to_df(results)
\ No newline at end of file
+        return df
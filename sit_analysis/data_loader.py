@@ -1,5 +1,7 @@
 import ast
-import deepof.data
+import re
+
+VIDEO_NAME = re.compile(r"^(?P<animal>.+?)_SIT.*\.(?P<session>\d+)$")
 
 
 
@@ -13,6 +15,9 @@ def read_tuples_file(path: str,
 
 def load_deepof_project(project_path: str,
                         conditions_path: str):
+    # deepof pulls in its deep-learning stack, only import it when a project is opened
+    import deepof.data
+
     project = deepof.data.load_project(project_path)
     if conditions_path:
         project.load_exp_conditions(conditions_path)
@@ -24,8 +29,16 @@ def load_deepof_project(project_path: str,
             })
     return project
 
+def parse_video_name(name: str):
+    """Return (animal ID, session) from a name like '<animal>_SIT<...>.<session>', or None."""
+    match = VIDEO_NAME.match(name)
+    return (match.group("animal"), int(match.group("session"))) if match else None
+
+def clean_video_name(video: str):
+    return '_'.join(video.split('DLC')[:1])
+
 def match_params_to_videos(videos,
                            arena_params,
                            siz_params):
-    cleaned_names = ['_'.join(x.split('DLC')[:1]) for x in videos]
+    cleaned_names = [clean_video_name(x) for x in videos]
     return dict(zip(cleaned_names, arena_params)), dict(zip(cleaned_names, siz_params))
\ No newline at end of file
@@ -0,0 +1,267 @@
+from typing import Any, Dict, Optional, Sequence, Union
+import numpy as np
+
+from .kernels import points_in_polygon, polygon_distance
+
+
+class DistanceField:
+    """
+    Distance grid over a video's geometry, sampled by bilinear interpolation.
+
+    The grid is computed once per geometry; afterwards per-frame distances
+    are vectorized lookups instead of exact point-to-polygon computations.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Grid of shape (ny, nx) with distances at cell centers, in pixels.
+    origin : tuple of float
+        [x, y] position of the grid's top-left corner.
+    resolution : float
+        Cell size in pixels.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        origin: Sequence[float],
+        resolution: float) -> None:
+
+        self.values: np.ndarray = values
+        self.origin: np.ndarray = np.asarray(origin, dtype=float)
+        self.resolution: float = resolution
+
+    @staticmethod
+    def grid_for(
+        vertices: Sequence[Sequence[float]],
+        resolution: float = 1.0,
+        margin: float = 0.1) -> tuple:
+        """
+        Grid origin and shape covering a set of vertices plus a margin.
+
+        Parameters
+        ----------
+        vertices : sequence of [x, y]
+            Points the grid must contain.
+        resolution : float, optional
+            Cell size in pixels. Default is 1.
+        margin : float, optional
+            Extra border as a fraction of the extent. Default is 0.1.
+
+        Returns
+        -------
+        tuple
+            Origin [x, y] and shape (ny, nx).
+        """
+        vertices = np.asarray(vertices, dtype=float)
+        low, high = vertices.min(axis=0), vertices.max(axis=0)
+        pad = (high - low) * margin + resolution
+        low, high = low - pad, high + pad
+        nx, ny = np.ceil((high - low) / resolution).astype(int)
+        return low, (ny, nx)
+
+    @classmethod
+    def from_polygon(
+        cls,
+        vertices: Sequence[Sequence[float]],
+        origin: Sequence[float],
+        shape: tuple,
+        resolution: float = 1.0) -> "DistanceField":
+        """
+        Signed distance to a polygon's boundary: negative inside, positive outside.
+
+        Parameters
+        ----------
+        vertices : sequence of [x, y]
+            Polygon corners in order.
+        origin : tuple of float
+            [x, y] of the grid's top-left corner.
+        shape : tuple of int
+            Grid shape (ny, nx).
+        resolution : float, optional
+            Cell size in pixels. Default is 1.
+
+        Returns
+        -------
+        DistanceField
+        """
+        from scipy.ndimage import distance_transform_edt
+
+        centers = cls._cell_centers(origin, shape, resolution)
+        inside = points_in_polygon(centers, np.asarray(vertices, dtype=float)).reshape(shape)
+
+        # The boundary lies half a cell between an inside and an outside center
+        outside_dist = distance_transform_edt(~inside) - 0.5
+        inside_dist = distance_transform_edt(inside) - 0.5
+        values = np.where(inside, -inside_dist, outside_dist) * resolution
+
+        return cls(values, origin, resolution)
+
+    @classmethod
+    def from_point(
+        cls,
+        point: Sequence[float],
+        origin: Sequence[float],
+        shape: tuple,
+        resolution: float = 1.0) -> "DistanceField":
+        """
+        Distance to a single point, e.g. the POI.
+
+        Parameters
+        ----------
+        point : [x, y]
+            Target point.
+        origin : tuple of float
+            [x, y] of the grid's top-left corner.
+        shape : tuple of int
+            Grid shape (ny, nx).
+        resolution : float, optional
+            Cell size in pixels. Default is 1.
+
+        Returns
+        -------
+        DistanceField
+        """
+        centers = cls._cell_centers(origin, shape, resolution)
+        values = np.sqrt(((centers - np.asarray(point, dtype=float)) ** 2).sum(axis=1))
+        return cls(values.reshape(shape), origin, resolution)
+
+    @staticmethod
+    def _cell_centers(origin: Sequence[float], shape: tuple, resolution: float) -> np.ndarray:
+        ny, nx = shape
+        xs = origin[0] + (np.arange(nx) + 0.5) * resolution
+        ys = origin[1] + (np.arange(ny) + 0.5) * resolution
+        grid_x, grid_y = np.meshgrid(xs, ys)
+        return np.column_stack([grid_x.ravel(), grid_y.ravel()])
+
+    def lookup(self, points: np.ndarray) -> np.ndarray:
+        """
+        Bilinearly interpolate the field at many points at once.
+
+        Points beyond the grid are clamped to its border; NaN points give NaN.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            Array of shape (n_frames, 2) with [x, y] coordinates.
+
+        Returns
+        -------
+        np.ndarray
+            Distance at each point, shape (n_frames,).
+        """
+        points = np.asarray(points, dtype=float)
+        ny, nx = self.values.shape
+        valid = np.isfinite(points).all(axis=1)
+
+        grid = (np.where(valid[:, None], points, 0.0) - self.origin) / self.resolution - 0.5
+        gx = np.clip(grid[:, 0], 0, nx - 1)
+        gy = np.clip(grid[:, 1], 0, ny - 1)
+        x0 = np.minimum(gx.astype(np.int64), max(nx - 2, 0))
+        y0 = np.minimum(gy.astype(np.int64), max(ny - 2, 0))
+        x1, y1 = np.minimum(x0 + 1, nx - 1), np.minimum(y0 + 1, ny - 1)
+        tx, ty = gx - x0, gy - y0
+
+        v = self.values
+        top = v[y0, x0] * (1 - tx) + v[y0, x1] * tx
+        bottom = v[y1, x0] * (1 - tx) + v[y1, x1] * tx
+        result = top * (1 - ty) + bottom * ty
+        result[~valid] = np.nan
+
+        return result
+
+
+class PolygonDistance:
+    """
+    Exact signed distance to a polygon's boundary, with the same ``lookup`` as ``DistanceField``.
+
+    Nothing is precomputed, so it is the cheaper choice for a geometry used
+    by only a few videos.
+
+    Parameters
+    ----------
+    vertices : sequence of [x, y]
+        Polygon corners in order.
+    """
+
+    def __init__(self, vertices: Sequence[Sequence[float]]) -> None:
+        self.vertices: np.ndarray = np.asarray(vertices, dtype=float)
+
+    def lookup(self, points: np.ndarray) -> np.ndarray:
+        """
+        Signed distance of many points at once, negative inside.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            Array of shape (n_frames, 2) with [x, y] coordinates.
+
+        Returns
+        -------
+        np.ndarray
+            Distance at each point, shape (n_frames,); NaN points give NaN.
+        """
+        return polygon_distance(points, self.vertices)
+
+
+# Either kind answers ``lookup(points)`` with signed distances
+ZoneDistance = Union[DistanceField, PolygonDistance]
+
+
+def exact_distances(
+    arena_vertices: np.ndarray,
+    siz_vertices: np.ndarray) -> Dict[str, PolygonDistance]:
+    """
+    Exact SIZ and arena-edge distances of one geometry.
+
+    Parameters
+    ----------
+    arena_vertices, siz_vertices : np.ndarray
+        Polygon corners in order, shape (4, 2).
+
+    Returns
+    -------
+    dict
+        ``"siz"`` and ``"arena"`` signed distances (negative inside), with the
+        same keys as ``build_distance_fields``.
+    """
+    return {"siz": PolygonDistance(siz_vertices), "arena": PolygonDistance(arena_vertices)}
+
+
+def build_distance_fields(
+    arena_vertices: np.ndarray,
+    siz_vertices: np.ndarray,
+    poi: Optional[np.ndarray] = None,
+    resolution: float = 1.0,
+    dtype: Any = np.float64) -> Dict[str, DistanceField]:
+    """
+    Precompute the SIZ, arena-edge and, optionally, POI distance fields of one geometry.
+
+    Parameters
+    ----------
+    arena_vertices, siz_vertices : np.ndarray
+        Polygon corners in order, shape (4, 2).
+    poi : np.ndarray, optional
+        Point of interest [x, y]. The POI field is only built if given.
+    resolution : float, optional
+        Cell size in pixels. Default is 1.
+    dtype : numpy dtype, optional
+        Storage type of the grids; float32 halves their memory. Default is
+        float64.
+
+    Returns
+    -------
+    dict
+        ``"siz"`` and ``"arena"`` signed fields (negative inside), plus the
+        ``"poi"`` distance field when ``poi`` is given.
+    """
+    origin, shape = DistanceField.grid_for(np.vstack([arena_vertices, siz_vertices]), resolution)
+    fields = {
+        "siz": DistanceField.from_polygon(siz_vertices, origin, shape, resolution),
+        "arena": DistanceField.from_polygon(arena_vertices, origin, shape, resolution),
+    }
+    if poi is not None:
+        fields["poi"] = DistanceField.from_point(poi, origin, shape, resolution)
+    for field in fields.values():
+        field.values = field.values.astype(dtype, copy=False)
+    return fields
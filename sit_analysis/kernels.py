@@ -0,0 +1,230 @@
+from typing import Any, Dict, Optional
+import numpy as np
+from .locomotion import bouts, locomotion_profile, step_lengths
+
+
+def points_in_polygon(
+    points: np.ndarray,
+    vertices: np.ndarray) -> np.ndarray:
+    """
+    Vectorized even-odd point-in-polygon test.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Array of shape (n_frames, 2) with [x, y] coordinates. NaN rows are
+        reported as outside the polygon.
+    vertices : np.ndarray
+        Array of shape (n_vertices, 2) with the polygon corners in order.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array of shape (n_frames,), True where the point is inside.
+    """
+    x, y = points[:, 0], points[:, 1]
+    inside = np.zeros(len(points), dtype=bool)
+    n_vertices = len(vertices)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i in range(n_vertices):
+            x1, y1 = vertices[i]
+            x2, y2 = vertices[(i + 1) % n_vertices]
+            crosses = (y1 > y) != (y2 > y)
+            x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+            inside ^= crosses & (x < x_cross)
+
+    return inside
+
+
+def polygon_distance(
+    points: np.ndarray,
+    vertices: np.ndarray) -> np.ndarray:
+    """
+    Exact signed distance to a polygon's boundary: negative inside, positive outside.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Array of shape (n_frames, 2) with [x, y] coordinates.
+    vertices : np.ndarray
+        Array of shape (n_vertices, 2) with the polygon corners in order.
+
+    Returns
+    -------
+    np.ndarray
+        Distance of each point to the nearest edge, shape (n_frames,); NaN
+        points give NaN.
+    """
+    points = np.asarray(points, dtype=float)
+    vertices = np.asarray(vertices, dtype=float)
+    squared = np.full(len(points), np.inf)
+
+    for i in range(len(vertices)):
+        start, edge = vertices[i], vertices[(i + 1) % len(vertices)] - vertices[i]
+        offset = points - start
+        t = np.clip(offset @ edge / max(float(edge @ edge), 1e-12), 0.0, 1.0)
+        np.minimum(squared, ((offset - t[:, None] * edge) ** 2).sum(axis=1), out=squared)
+
+    distance = np.sqrt(squared)
+    distance[points_in_polygon(points, vertices)] *= -1
+    distance[~np.isfinite(points).all(axis=1)] = np.nan
+    return distance
+
+
+def fill_gaps(
+    points: np.ndarray,
+    max_gap: Optional[int] = None) -> np.ndarray:
+    """
+    Linearly fill missing values, in place, the way ``DataFrame.interpolate`` does.
+
+    Each coordinate column is filled independently, as pandas does: leading
+    missing values stay NaN and trailing ones hold the last valid value.
+    Runs longer than ``max_gap`` frames are left as NaN.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Float array of shape (n_frames, n_columns) with NaN for missing values.
+    max_gap : int, optional
+        Longest run of missing frames to fill. Default (None) fills all.
+
+    Returns
+    -------
+    np.ndarray
+        The same array, with short gaps filled.
+    """
+    n_frames = len(points)
+
+    for k in range(points.shape[1]):
+        column = points[:, k]
+        valid = np.isfinite(column)
+        if valid.all():
+            continue
+
+        column[~valid] = np.nan
+        valid_idx = np.flatnonzero(valid)
+        if valid_idx.size == 0:
+            continue
+
+        missing = np.flatnonzero(~valid)
+        column[missing] = np.interp(missing, valid_idx, column[valid_idx])
+        column[:valid_idx[0]] = np.nan
+
+        if max_gap is not None:
+            starts, lengths = bouts(~valid)
+            too_long = lengths > max_gap
+            marks = np.zeros(n_frames + 1, dtype=np.int64)
+            np.add.at(marks, starts[too_long], 1)
+            np.add.at(marks, starts[too_long] + lengths[too_long], -1)
+            column[np.cumsum(marks[:-1]) > 0] = np.nan
+
+    return points
+
+
+def fused_sit_metrics(
+    center: np.ndarray,
+    nose: np.ndarray,
+    siz_vertices: np.ndarray,
+    poi: np.ndarray,
+    max_dist: float,
+    fps: float,
+    px_size: float,
+    center_likelihood: Optional[np.ndarray] = None,
+    nose_likelihood: Optional[np.ndarray] = None,
+    likelihood_threshold: Optional[float] = None,
+    max_gap: Optional[int] = None,
+    speed_window: float = 1.0,
+    immobility_speed: float = 2.0,
+    min_immobility_bout: float = 1.0,
+    distance_fields: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """
+    Compute all per-video SIT metrics from raw coordinates in one pass.
+
+    Low-confidence points are masked, short gaps are filled, and the in-SIZ
+    time, POI distances, path length and locomotion profile are computed
+    directly on NumPy arrays without building intermediate DataFrames.
+
+    Parameters
+    ----------
+    center, nose : np.ndarray
+        Arrays of shape (n_frames, 2) with raw [x, y] coordinates.
+    siz_vertices : np.ndarray
+        SIZ polygon corners, shape (4, 2).
+    poi : np.ndarray
+        Point of interest [x, y].
+    max_dist : float
+        Distance used to normalize POI distances.
+    fps : float
+        Video frame rate in frames per second.
+    px_size : float
+        Physical size of one pixel.
+    center_likelihood, nose_likelihood : np.ndarray, optional
+        Detection confidence per frame, shape (n_frames,).
+    likelihood_threshold : float, optional
+        Points with a likelihood below this value are masked. Default (None)
+        keeps every point.
+    max_gap : int, optional
+        Longest run of missing frames to fill. Default (None) fills all.
+    speed_window, immobility_speed, min_immobility_bout : float, optional
+        Passed to ``locomotion.locomotion_profile``.
+    distance_fields : dict, optional
+        Precomputed ``"siz"`` and ``"arena"`` fields from
+        ``distance_field.build_distance_fields``; adds the mean signed Center
+        distance to the SIZ boundary and the mean distance to the arena edge.
+
+    Returns
+    -------
+    dict
+        ``time_in_siz``, ``distance_to_poi``, ``normalized_distance_to_poi``,
+        ``total_distance``, ``masked_fraction`` and the locomotion profile
+        (``mean_speed``, ``max_speed``, ``time_immobile``,
+        ``immobility_bouts``), plus ``distance_to_siz`` and
+        ``distance_to_arena_edge`` when ``distance_fields`` is given.
+    """
+    center = np.array(center, dtype=float)
+    nose = np.array(nose, dtype=float)
+    n_frames = len(center)
+
+    masked = np.zeros(n_frames, dtype=bool)
+    if likelihood_threshold is not None:
+        for points, likelihood in ((center, center_likelihood), (nose, nose_likelihood)):
+            if likelihood is None:
+                continue
+            low = np.asarray(likelihood, dtype=float) < likelihood_threshold
+            points[low] = np.nan
+            masked |= low
+
+    fill_gaps(center, max_gap)
+    fill_gaps(nose, max_gap)
+
+    in_zone = points_in_polygon(center, np.asarray(siz_vertices, dtype=float))
+
+    mean_dist = _nanmean(np.sqrt(((nose - poi) ** 2).sum(axis=1)))
+
+    steps = step_lengths(center)
+
+    metrics = {
+        "time_in_siz": float(np.count_nonzero(in_zone)) / fps,
+        "distance_to_poi": mean_dist,
+        "normalized_distance_to_poi": mean_dist / max_dist,
+        "total_distance": float(np.nansum(steps)) * px_size,
+        "masked_fraction": float(np.count_nonzero(masked)) / n_frames if n_frames else 0.0,
+    }
+    metrics.update(locomotion_profile(
+        steps, px_size, fps,
+        speed_window=speed_window,
+        immobility_speed=immobility_speed,
+        min_immobility_bout=min_immobility_bout,
+    ))
+
+    if distance_fields is not None:
+        metrics["distance_to_siz"] = _nanmean(distance_fields["siz"].lookup(center))
+        metrics["distance_to_arena_edge"] = -_nanmean(distance_fields["arena"].lookup(center))
+
+    return metrics
+
+
+def _nanmean(values: np.ndarray) -> float:
+    finite = np.isfinite(values)
+    return float(values[finite].mean()) if finite.any() else float("nan")
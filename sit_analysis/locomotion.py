@@ -0,0 +1,132 @@
+from typing import Dict, Tuple
+import numpy as np
+
+
+def step_lengths(points: np.ndarray) -> np.ndarray:
+    """
+    Euclidean distance between consecutive frames.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Array of shape (n_frames, 2) with [x, y] coordinates.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n_frames - 1,), NaN where either frame is missing.
+    """
+    return np.sqrt((np.diff(np.asarray(points, dtype=float), axis=0) ** 2).sum(axis=1))
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Centered moving average computed from cumulative sums in linear time.
+
+    Window ``i`` covers ``i - window // 2`` to ``i + window - window // 2 - 1``,
+    like pandas ``rolling(center=True, min_periods=1)``; it is truncated at
+    both edges of the array, and NaNs are skipped.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1-D array to smooth.
+    window : int
+        Window length in samples.
+
+    Returns
+    -------
+    np.ndarray
+        Smoothed array of the same length, NaN where a window holds no data.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if window <= 1 or n == 0:
+        return values.copy()
+
+    finite = np.isfinite(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(finite, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(finite)))
+
+    index = np.arange(n)
+    start = np.maximum(index - window // 2, 0)
+    stop = np.minimum(index + (window - window // 2), n)
+    window_counts = counts[stop] - counts[start]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(window_counts > 0, (sums[stop] - sums[start]) / window_counts, np.nan)
+
+
+def bouts(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Start indices and lengths of consecutive True runs.
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        1-D boolean array.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Start index and length of each run.
+    """
+    edges = np.diff(np.concatenate(([0], np.asarray(mask).astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    return starts, ends - starts
+
+
+def locomotion_profile(
+    steps: np.ndarray,
+    px_size: float,
+    fps: float,
+    speed_window: float = 1.0,
+    immobility_speed: float = 2.0,
+    min_immobility_bout: float = 1.0) -> Dict[str, float]:
+    """
+    Summarize speed and immobility from a step-length array.
+
+    Parameters
+    ----------
+    steps : np.ndarray
+        Step lengths in pixels between consecutive frames.
+    px_size : float
+        Physical size of one pixel (cm).
+    fps : float
+        Video frame rate in frames per second.
+    speed_window : float, optional
+        Length of the smoothing window in seconds. Default is 1.
+    immobility_speed : float, optional
+        Smoothed speed (cm/s) under which the animal counts as immobile.
+        Default is 2.
+    min_immobility_bout : float, optional
+        Shortest immobile stretch (s) counted as a bout. Default is 1.
+
+    Returns
+    -------
+    dict
+        ``mean_speed`` and ``max_speed`` (cm/s), ``time_immobile`` (s) and
+        ``immobility_bouts`` (count).
+    """
+    speed = rolling_mean(
+        np.asarray(steps, dtype=float) * px_size * fps,
+        max(int(round(speed_window * fps)), 1),
+    )
+    finite = np.isfinite(speed)
+    if not finite.any():
+        return {
+            "mean_speed": float("nan"),
+            "max_speed": float("nan"),
+            "time_immobile": 0.0,
+            "immobility_bouts": 0,
+        }
+
+    _, lengths = bouts(finite & (speed < immobility_speed))
+    lengths = lengths[lengths >= max(int(round(min_immobility_bout * fps)), 1)]
+
+    return {
+        "mean_speed": float(speed[finite].mean()),
+        "max_speed": float(speed[finite].max()),
+        "time_immobile": float(lengths.sum()) / fps,
+        "immobility_bouts": int(len(lengths)),
+    }
@@ -0,0 +1,190 @@
+from typing import Dict, List, Tuple
+import numpy as np
+
+
+def normalize_to_arena(
+    points: np.ndarray,
+    arena_coords: List[Tuple[float, float]]) -> np.ndarray:
+    """
+    Map [x, y] points into arena-relative [u, v] coordinates in [0, 1].
+
+    The arena is treated as the parallelogram spanned from its top-left
+    corner by the top edge (u axis) and the left edge (v axis), so arenas of
+    different sizes and slight rotations land on the same unit square.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Array of shape (n_frames, 2) with [x, y] coordinates.
+    arena_coords : list of tuple of float
+        Arena corners as [top-left, bottom-left, bottom-right, top-right].
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n_frames, 2) with [u, v] coordinates.
+    """
+    top_left, bottom_left, _, top_right = (np.asarray(c, dtype=float) for c in arena_coords)
+    basis = np.column_stack([top_right - top_left, bottom_left - top_left])
+    return np.linalg.solve(basis, (np.asarray(points, dtype=float) - top_left).T).T
+
+
+def occupancy_histogram(
+    points: np.ndarray,
+    arena_coords: List[Tuple[float, float]],
+    bins: int,
+    tolerance: float = 0.01) -> Tuple[np.ndarray, int]:
+    """
+    Count frames per cell of a bins x bins grid laid over the arena.
+
+    Points within ``tolerance`` of the arena edge are counted in the border
+    cells. Points farther outside (tracking outliers, reflections) are not
+    binned, so they cannot pass for wall occupancy; they are counted
+    separately. Frames with missing coordinates are ignored.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Array of shape (n_frames, 2) with [x, y] coordinates.
+    arena_coords : list of tuple of float
+        Arena corners as [top-left, bottom-left, bottom-right, top-right].
+    bins : int
+        Number of cells along each arena axis.
+    tolerance : float, optional
+        Margin outside the arena, as a fraction of its sides, still counted
+        in the border cells. Default is 0.01.
+
+    Returns
+    -------
+    tuple
+        uint32 array of shape (bins, bins), whose rows follow the arena's left
+        edge (top to bottom) and columns its top edge (left to right), and the
+        number of frames outside the arena.
+    """
+    uv = normalize_to_arena(points, arena_coords)
+    uv = uv[np.isfinite(uv).all(axis=1)]
+    inside = ((uv >= -tolerance) & (uv <= 1 + tolerance)).all(axis=1)
+    cells = np.clip((uv[inside] * bins).astype(np.int64), 0, bins - 1)
+    flat = cells[:, 1] * bins + cells[:, 0]
+    counts = np.bincount(flat, minlength=bins * bins).astype(np.uint32).reshape(bins, bins)
+    return counts, int(len(uv) - np.count_nonzero(inside))
+
+
+class OccupancyAccumulator:
+    """
+    Incrementally collect per-video and per-group occupancy maps.
+
+    Only the histograms and the number of frames outside the arena are kept;
+    trajectories can be discarded as soon as they have been added.
+
+    Parameters
+    ----------
+    bins : int, optional
+        Number of cells along each arena axis. Default is 50.
+    """
+
+    def __init__(self, bins: int = 50) -> None:
+        self.bins: int = bins
+        self.video_maps: Dict[str, np.ndarray] = {}
+        self.video_groups: Dict[str, str] = {}
+        self.video_outside: Dict[str, int] = {}
+        self._group_sums: Dict[str, np.ndarray] = {}
+        self._group_counts: Dict[str, int] = {}
+
+    def add(
+        self,
+        video: str,
+        group: str,
+        points: np.ndarray,
+        arena_coords: List[Tuple[float, float]]) -> np.ndarray:
+        """
+        Histogram one video's trajectory and fold it into its group.
+
+        Parameters
+        ----------
+        video : str
+            Video name.
+        group : str
+            Group the video belongs to, e.g. "Control_Session1".
+        points : np.ndarray
+            Array of shape (n_frames, 2) with [x, y] coordinates.
+        arena_coords : list of tuple of float
+            Arena corners of this video.
+
+        Returns
+        -------
+        np.ndarray
+            The video's occupancy counts, without frames outside the arena.
+        """
+        counts, outside = occupancy_histogram(points, arena_coords, self.bins)
+        if video in self.video_maps:
+            print(f"{video} occupancy already computed, replacing it")
+            self._remove(video)
+
+        self.video_maps[video] = counts
+        self.video_groups[video] = group
+        self.video_outside[video] = outside
+
+        # Each video contributes its fraction of time per cell
+        total = counts.sum()
+        if group not in self._group_sums:
+            self._group_sums[group] = np.zeros((self.bins, self.bins))
+            self._group_counts[group] = 0
+        if total:
+            self._group_sums[group] += counts / total
+        self._group_counts[group] += 1
+
+        return counts
+
+    def _remove(self, video: str) -> None:
+        counts, group = self.video_maps.pop(video), self.video_groups.pop(video)
+        self.video_outside.pop(video)
+        total = counts.sum()
+        if total:
+            self._group_sums[group] -= counts / total
+        self._group_counts[group] -= 1
+
+    def group_maps(self) -> Dict[str, np.ndarray]:
+        """
+        Average occupancy map of each group.
+
+        Returns
+        -------
+        dict
+            Mapping group → (bins, bins) array of mean time fraction per cell.
+        """
+        return {
+            group: self._group_sums[group] / count
+            for group, count in self._group_counts.items() if count
+        }
+
+    def save(self, path: str) -> None:
+        """
+        Save all maps to a compressed ``.npz`` archive.
+
+        The archive holds ``videos``/``video_groups``/``video_maps`` (uint32
+        counts), ``video_outside`` (frames outside the arena, not in the maps)
+        and ``groups``/``group_counts``/``group_maps`` (float32 mean
+        fractions).
+
+        Parameters
+        ----------
+        path : str
+            Output file path.
+        """
+        videos = sorted(self.video_maps)
+        group_maps = self.group_maps()
+        groups = sorted(group_maps)
+        empty = np.zeros((0, self.bins, self.bins))
+
+        np.savez_compressed(
+            path,
+            bins=self.bins,
+            videos=np.array(videos, dtype=str),
+            video_groups=np.array([self.video_groups[v] for v in videos], dtype=str),
+            video_maps=np.stack([self.video_maps[v] for v in videos]) if videos else empty.astype(np.uint32),
+            video_outside=np.array([self.video_outside[v] for v in videos], dtype=np.int64),
+            groups=np.array(groups, dtype=str),
+            group_counts=np.array([self._group_counts[g] for g in groups], dtype=np.int64),
+            group_maps=np.stack([group_maps[g] for g in groups]).astype(np.float32) if groups else empty.astype(np.float32),
+        )
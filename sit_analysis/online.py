@@ -0,0 +1,166 @@
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+from .kernels import points_in_polygon
+
+
+class OnlineSITAnalyzer:
+    """
+    Streaming counterpart of ``SITAnalyzer`` for live tracking feeds.
+
+    Frames are pushed one at a time or in small batches; every metric is kept
+    as a running total, so each frame costs O(1) and no buffer grows with the
+    session. Missing frames (NaN) are forward-filled with the last valid point.
+
+    On complete data the final values match ``SITAnalyzer.time_in_SIZ``,
+    ``distance_to_poi`` (mean) and ``total_distance_traveled``. With gaps the
+    offline pipeline interpolates linearly, which an online reader cannot do;
+    the path length is unaffected, in-SIZ time and mean distance may differ.
+
+    Parameters
+    ----------
+    arena_coords : list of tuple of float
+        Coordinates of the arena corners in the following order:
+        [top-left, bottom-left, bottom-right, top-right].
+    siz_coords : list of tuple of float
+        Coordinates of the Social Interaction Zone (SIZ) in the same order.
+    fps : float, optional
+        Video frame rate in frames per second. Default is 30.
+    px_size : float, optional
+        Physical size of one pixel. Default is 1.
+    """
+
+    def __init__(
+        self,
+        arena_coords: List[Tuple[float, float]],
+        siz_coords: List[Tuple[float, float]],
+        fps: float = 30,
+        px_size: float = 1.0) -> None:
+
+        self.FPS: float = fps
+        self.px_size: float = px_size
+
+        top_left_arena, bottom_left_arena, _, top_right_arena = arena_coords
+        top_left_SIZ, bottom_left_SIZ, bottom_right_SIZ, top_right_SIZ = siz_coords
+
+        # Same geometry as SITAnalyzer
+        self.siz_vertices: np.ndarray = np.array([
+            bottom_left_SIZ, bottom_right_SIZ, top_right_SIZ, top_left_SIZ
+        ], dtype=float)
+        self.POI: np.ndarray = np.mean([top_left_arena, top_right_arena], axis=0)
+        self.max_dist: float = float(np.linalg.norm(self.POI - np.array(bottom_left_arena)))
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all running state to start a new session."""
+        self.n_frames: int = 0
+        self.frames_in_siz: int = 0
+        self.siz_entries: int = 0
+        self.in_siz: bool = False
+        self.current_bout: int = 0
+        self.path_length: float = 0.0
+        self._distance_sum: float = 0.0
+        self._distance_count: int = 0
+        self._last_center: Optional[np.ndarray] = None
+        self._last_nose: Optional[np.ndarray] = None
+
+    @staticmethod
+    def _forward_fill(
+        points: np.ndarray,
+        last: Optional[np.ndarray]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Replace NaN rows with the previous valid point.
+
+        Rows before any valid point stay NaN. Returns the filled batch and a
+        copy of the last valid point to carry into the next batch, so callers
+        may reuse their input buffer.
+        """
+        valid = np.isfinite(points).all(axis=1)
+        if valid.all():
+            return points, points[-1].copy()
+
+        filled = np.empty_like(points)
+        idx = np.where(valid, np.arange(len(points)), -1)
+        np.maximum.accumulate(idx, out=idx)
+        has_prev = idx >= 0
+        filled[has_prev] = points[idx[has_prev]]
+        filled[~has_prev] = np.nan if last is None else last
+
+        return filled, (filled[-1].copy() if np.isfinite(filled[-1]).all() else last)
+
+    def push(
+        self,
+        center: np.ndarray,
+        nose: Optional[np.ndarray] = None) -> None:
+        """
+        Feed one frame or a batch of frames.
+
+        Parameters
+        ----------
+        center : np.ndarray
+            Center [x, y] of shape (2,) or (n_frames, 2); NaN marks a missing
+            detection. Used for in-SIZ time and path length.
+        nose : np.ndarray, optional
+            Nose coordinates with the same shape, used for the POI distance.
+            Defaults to ``center``.
+        """
+        center = np.atleast_2d(np.asarray(center, dtype=float))
+        nose = center if nose is None else np.atleast_2d(np.asarray(nose, dtype=float))
+        if center.shape[1] != 2 or nose.shape != center.shape:
+            raise ValueError("center and nose must be [x, y] points with matching shapes.")
+        if len(center) == 0:
+            return
+
+        previous = self._last_center
+        center, self._last_center = self._forward_fill(center, previous)
+        nose, self._last_nose = self._forward_fill(nose, self._last_nose)
+
+        # Path length, including the step from the previous batch
+        steps = np.diff(center if previous is None else np.vstack([previous, center]), axis=0)
+        self.path_length += float(np.nansum(np.sqrt((steps ** 2).sum(axis=1)))) * self.px_size
+
+        # Running mean distance to the POI
+        distances = np.sqrt(((nose - self.POI) ** 2).sum(axis=1))
+        finite = np.isfinite(distances)
+        self._distance_sum += float(distances[finite].sum())
+        self._distance_count += int(np.count_nonzero(finite))
+
+        # In-SIZ time and bout state
+        in_zone = points_in_polygon(center, self.siz_vertices)
+        self.frames_in_siz += int(np.count_nonzero(in_zone))
+        self.siz_entries += int(np.count_nonzero(in_zone[1:] & ~in_zone[:-1]))
+        self.siz_entries += int(in_zone[0] and not self.in_siz)
+
+        outside = np.flatnonzero(~in_zone)
+        if outside.size == 0:
+            self.current_bout += len(in_zone)
+        else:
+            self.current_bout = len(in_zone) - 1 - int(outside[-1])
+        self.in_siz = bool(in_zone[-1])
+        self.n_frames += len(center)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current value of every metric.
+
+        Returns
+        -------
+        dict
+            ``n_frames``, ``time_in_siz`` (s), ``distance_to_poi`` and
+            ``normalized_distance_to_poi`` (running means),
+            ``total_distance``, ``in_siz``, ``current_bout`` (s, 0 when
+            outside) and ``siz_entries``.
+        """
+        mean_dist = (self._distance_sum / self._distance_count
+                     if self._distance_count else float("nan"))
+        return {
+            "n_frames": self.n_frames,
+            "time_in_siz": self.frames_in_siz / self.FPS,
+            "distance_to_poi": mean_dist,
+            "normalized_distance_to_poi": mean_dist / self.max_dist,
+            "total_distance": self.path_length,
+            "in_siz": self.in_siz,
+            "current_bout": self.current_bout / self.FPS,
+            "siz_entries": self.siz_entries,
+        }
@@ -0,0 +1,307 @@
+"""
+Render QC overlay videos: arena, SIZ, POI and the Center/Nose trajectory
+drawn on every frame, plus a contact sheet per video for quick triage.
+
+Videos are read strictly sequentially (skipped frames are grabbed, never
+seeked) and many videos are rendered in parallel processes.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .data_loader import clean_video_name
+
+ARENA_COLOR = (255, 200, 0)
+SIZ_COLOR = (40, 86, 236)
+POI_COLOR = (0, 255, 255)
+CENTER_COLOR = (0, 255, 0)
+NOSE_COLOR = (255, 0, 255)
+
+
+def _scaled(points: np.ndarray, scale: float) -> np.ndarray:
+    return np.round(np.asarray(points, dtype=float) * scale).astype(np.int32)
+
+
+def _draw_trail(frame: np.ndarray, trail: np.ndarray, color: Tuple[int, int, int]) -> None:
+    """Draw a trajectory segment, breaking it at missing points."""
+    valid = np.isfinite(trail).all(axis=1)
+    points = np.round(np.where(valid[:, None], trail, 0)).astype(int)
+    for i in np.flatnonzero(valid[1:] & valid[:-1]):
+        cv2.line(frame, tuple(points[i]), tuple(points[i + 1]), color, 1)
+    if len(trail) and valid[-1]:
+        cv2.circle(frame, tuple(points[-1]), 4, color, -1)
+
+
+def draw_overlay(
+    frame: np.ndarray,
+    arena_coords: List[Tuple[float, float]],
+    siz_coords: List[Tuple[float, float]],
+    center_trail: np.ndarray,
+    nose_trail: np.ndarray,
+    scale: float = 1.0) -> np.ndarray:
+    """
+    Draw arena, SIZ, POI and trajectories on a frame, in place.
+
+    Parameters
+    ----------
+    frame : np.ndarray
+        BGR frame, already downscaled by ``scale``.
+    arena_coords, siz_coords : list of tuple of float
+        Corners as [top-left, bottom-left, bottom-right, top-right], in
+        original video pixels.
+    center_trail, nose_trail : np.ndarray
+        Recent positions of shape (n, 2), last row being the current frame.
+    scale : float, optional
+        Downscaling factor applied to the frame. Default is 1.
+
+    Returns
+    -------
+    np.ndarray
+        The annotated frame.
+    """
+    cv2.polylines(frame, [_scaled(arena_coords, scale)], True, ARENA_COLOR, 2)
+    cv2.polylines(frame, [_scaled(siz_coords, scale)], True, SIZ_COLOR, 2)
+
+    top_left, _, _, top_right = arena_coords
+    poi = np.mean([top_left, top_right], axis=0) * scale
+    cv2.circle(frame, (int(round(poi[0])), int(round(poi[1]))), 5, POI_COLOR, -1)
+
+    _draw_trail(frame, center_trail * scale, CENTER_COLOR)
+    _draw_trail(frame, nose_trail * scale, NOSE_COLOR)
+    return frame
+
+
+def contact_sheet(frames: List[np.ndarray], columns: int = 4) -> np.ndarray:
+    """
+    Tile frames into a single image, row by row.
+
+    Parameters
+    ----------
+    frames : list of np.ndarray
+        Frames of identical shape.
+    columns : int, optional
+        Number of tiles per row. Default is 4.
+
+    Returns
+    -------
+    np.ndarray
+        The tiled image.
+    """
+    height, width = frames[0].shape[:2]
+    rows = -(-len(frames) // columns)
+    sheet = np.zeros((rows * height, columns * width, 3), dtype=np.uint8)
+    for i, frame in enumerate(frames):
+        r, c = divmod(i, columns)
+        sheet[r * height:(r + 1) * height, c * width:(c + 1) * width] = frame
+    return sheet
+
+
+def render_qc_video(
+    video_path: str,
+    output_path: str,
+    arena_coords: List[Tuple[float, float]],
+    siz_coords: List[Tuple[float, float]],
+    center: np.ndarray,
+    nose: np.ndarray,
+    stride: int = 1,
+    scale: float = 0.5,
+    trail: int = 30,
+    sheet_path: Optional[str] = None,
+    sheet_tiles: int = 12) -> Dict[str, Any]:
+    """
+    Render one QC overlay video and, optionally, its contact sheet.
+
+    Parameters
+    ----------
+    video_path : str
+        Source video.
+    output_path : str
+        Output video path (mp4).
+    arena_coords, siz_coords : list of tuple of float
+        Arena and SIZ corners of this video.
+    center, nose : np.ndarray
+        Tracked [x, y] per frame, shape (n_frames, 2).
+    stride : int, optional
+        Render every ``stride``-th frame. Default is 1.
+    scale : float, optional
+        Downscaling factor of the output. Default is 0.5.
+    trail : int, optional
+        Number of past source frames drawn as trajectory. Default is 30.
+    sheet_path : str, optional
+        If given, save a contact sheet image there.
+    sheet_tiles : int, optional
+        Number of evenly spaced frames on the contact sheet. Default is 12.
+
+    Returns
+    -------
+    dict
+        ``video``, ``output``, ``sheet`` and ``frames_written``.
+    """
+    capture = cv2.VideoCapture(video_path)
+    if not capture.isOpened():
+        raise RuntimeError(f"Failed to open video: {video_path}")
+
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30
+    n_frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT)) or len(center)
+    width = int(round(capture.get(cv2.CAP_PROP_FRAME_WIDTH) * scale))
+    height = int(round(capture.get(cv2.CAP_PROP_FRAME_HEIGHT) * scale))
+
+    writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*"mp4v"), fps / stride, (width, height))
+    if not writer.isOpened():
+        capture.release()
+        raise RuntimeError(f"Failed to open video writer: {output_path}")
+
+    # Contact sheet tiles are picked up front so the pass stays sequential
+    kept = np.arange(0, n_frames, stride)
+    sheet_frames = set()
+    if sheet_path and len(kept):
+        sheet_frames = set(kept[np.linspace(0, len(kept) - 1, min(sheet_tiles, len(kept))).astype(int)])
+    tiles: List[np.ndarray] = []
+
+    center = np.asarray(center, dtype=float)
+    nose = np.asarray(nose, dtype=float)
+    frames_written = 0
+
+    for index in range(n_frames):
+        # Grab without decoding frames that are skipped by the stride
+        if not capture.grab():
+            break
+        if index % stride:
+            continue
+        ok, frame = capture.retrieve()
+        if not ok:
+            break
+
+        if scale != 1.0:
+            frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        start = max(index - trail + 1, 0)
+        draw_overlay(frame, arena_coords, siz_coords, center[start:index + 1], nose[start:index + 1], scale)
+        cv2.putText(frame, f"{index}", (5, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+        writer.write(frame)
+        frames_written += 1
+        if index in sheet_frames:
+            tiles.append(frame.copy())
+
+    capture.release()
+    writer.release()
+
+    if sheet_path and tiles:
+        cv2.imwrite(sheet_path, contact_sheet(tiles))
+
+    return {"video": video_path, "output": output_path, "sheet": sheet_path, "frames_written": frames_written}
+
+
+def render_many(jobs: List[Dict[str, Any]], processes: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Render several QC videos in parallel processes.
+
+    Parameters
+    ----------
+    jobs : list of dict
+        Keyword arguments for ``render_qc_video``, one dict per video.
+    processes : int, optional
+        Number of worker processes. Default uses all CPUs.
+
+    Returns
+    -------
+    list of dict
+        Results of ``render_qc_video``, in completion order. A video that
+        failed is reported as ``{"video": ..., "output": ..., "error": ...}``.
+    """
+    results = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {pool.submit(render_qc_video, **job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as error:
+                results.append({"video": job["video_path"], "output": job["output_path"], "error": str(error)})
+    return results
+
+
+def experience_jobs(
+    experience: Any,
+    output_dir: str,
+    **render_kwargs: Any) -> List[Dict[str, Any]]:
+    """
+    Build one render job per video of an ``Experience``, using its arena/SIZ maps.
+
+    Parameters
+    ----------
+    experience : Experience
+        Loaded experiment.
+    output_dir : str
+        Directory for the QC videos and contact sheets.
+    **render_kwargs
+        Extra arguments for ``render_qc_video`` (stride, scale, ...).
+
+    Returns
+    -------
+    list of dict
+        Jobs for ``render_many``.
+    """
+    project = experience.project
+    video_dir = os.path.join(project._project_path, project._project_name, "Videos")
+    jobs = []
+
+    for video in project._videos:
+        name = clean_video_name(video)
+        if name not in experience.arena_map or name not in experience.siz_map or name not in project._tables:
+            continue
+
+        table = project._tables[name]
+        jobs.append({
+            "video_path": os.path.join(video_dir, video),
+            "output_path": os.path.join(output_dir, f"{name}_qc.mp4"),
+            "arena_coords": experience.arena_map[name],
+            "siz_coords": experience.siz_map[name],
+            "center": table[[("Center", "x"), ("Center", "y")]].to_numpy(dtype=float),
+            "nose": table[[("Nose", "x"), ("Nose", "y")]].to_numpy(dtype=float),
+            "sheet_path": os.path.join(output_dir, f"{name}_sheet.png"),
+            **render_kwargs,
+        })
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render QC overlay videos for a DeepOF project.")
+    parser.add_argument("--project_path", required=True)
+    parser.add_argument("--conditions_path", required=True)
+    parser.add_argument("--arena_path", required=True)
+    parser.add_argument("--siz_path", required=True)
+    parser.add_argument("--output_dir", required=True)
+    parser.add_argument("--stride", type=int, default=1, help="Render every n-th frame")
+    parser.add_argument("--scale", type=float, default=0.5, help="Output downscaling factor")
+    parser.add_argument("--trail", type=int, default=30, help="Trajectory length in frames")
+    parser.add_argument("--processes", type=int, default=None, help="Parallel worker processes")
+    args = parser.parse_args()
+
+    from .analyzer import Experience
+
+    experience = Experience(args.project_path, args.conditions_path, args.arena_path, args.siz_path)
+    os.makedirs(args.output_dir, exist_ok=True)
+    jobs = experience_jobs(experience, args.output_dir,
+                           stride=args.stride, scale=args.scale, trail=args.trail)
+
+    failed = 0
+    for result in render_many(jobs, args.processes):
+        if "error" in result:
+            failed += 1
+            print(f"{result['video']} failed: {result['error']}")
+        else:
+            print(f"Saved {result['output']} ({result['frames_written']} frames)")
+
+    if failed:
+        print(f"{failed} of {len(jobs)} video(s) failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+SESSIONS = (1, 2)
+
+# Per-session metrics, in output order around the SIR block
+LEADING_METRICS = ("Time_in_SIZ", "Normalized_distance_to_POI")
+TRAILING_METRICS = (
+    "Total_Distance_Traveled",
+    "Mean_speed", "Max_speed", "Time_immobile", "Immobility_bouts",
+)
+# Counts, written out as nullable integers
+COUNT_METRICS = ("Immobility_bouts",)
+# Only written out when at least one session reported them
+OPTIONAL_METRICS = ("Masked_fraction", "Distance_to_SIZ", "Distance_to_arena_edge")
+
+SIR_COLUMNS = (
+    "Time_SIR_typeB", "Distance_SIR_typeB", "Social_Engagement_Index",
+    "Time_SIR_typeA", "Distance_SIR_typeA",
+)
+
+
+class ResultAccumulator:
+    """
+    Columnar store of per-session metrics, paired into one row per animal.
+
+    Rows are appended into preallocated typed arrays that grow by doubling;
+    pairing Session1/Session2 and computing the SIR columns happen once, in
+    bulk, in ``to_frame``. Metric values are held as floats; ``COUNT_METRICS``
+    are cast back to nullable ``Int64`` columns in the output. Rows whose session is not in ``SESSIONS`` are
+    skipped and listed in ``self.skipped``.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Initial number of rows. Default is 1024.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._animal_codes: Dict[str, int] = {}
+        self._metric_codes: Dict[str, int] = {}
+        self._animals = np.empty(capacity, dtype=np.int32)
+        self._sessions = np.empty(capacity, dtype=np.int16)
+        self._values = np.full((capacity, 0), np.nan)
+        self._size: int = 0
+        self._present = np.zeros((0, len(SESSIONS)), dtype=bool)
+        self.missing: pd.DataFrame = pd.DataFrame(columns=["Animal_ID", "Missing_sessions", "Skipped_sessions"])
+        self.skipped: List[Tuple[str, int]] = []
+        self.duplicates: int = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self, rows: int, metrics: int) -> None:
+        capacity, n_metrics = self._values.shape
+        if rows <= capacity and metrics <= n_metrics:
+            return
+
+        if rows > capacity:
+            capacity = max(rows, 2 * capacity)
+            self._animals = np.resize(self._animals, capacity)
+            self._sessions = np.resize(self._sessions, capacity)
+        values = np.full((capacity, max(metrics, n_metrics)), np.nan)
+        values[:self._size, :n_metrics] = self._values[:self._size]
+        self._values = values
+
+    def append(self, animal_id: str, session: int, metrics: Dict[str, float]) -> None:
+        """
+        Add the metrics of one session.
+
+        A session other than 1 or 2 is not stored; it is recorded in
+        ``self.skipped`` and reported by ``to_frame`` and ``report``.
+
+        Parameters
+        ----------
+        animal_id : str
+            Animal identifier.
+        session : int
+            SIT session number (1 or 2).
+        metrics : dict
+            Metric name (without session suffix) → value.
+        """
+        if session not in SESSIONS:
+            self.skipped.append((animal_id, session))
+            return
+
+        for name in metrics:
+            self._metric_codes.setdefault(name, len(self._metric_codes))
+        self._grow(self._size + 1, len(self._metric_codes))
+
+        row = self._size
+        self._animals[row] = self._animal_codes.setdefault(animal_id, len(self._animal_codes))
+        self._sessions[row] = session
+        for name, value in metrics.items():
+            self._values[row, self._metric_codes[name]] = value
+        self._size += 1
+
+    @classmethod
+    def from_results_dict(cls, results_dict: Dict[str, Dict[str, Any]]) -> "ResultAccumulator":
+        """
+        Build an accumulator from the legacy Animal_ID → suffixed-metrics dict.
+
+        Parameters
+        ----------
+        results_dict : dict
+            Mapping Animal_ID → {"<metric>_Session<n>": value, ...}.
+
+        Returns
+        -------
+        ResultAccumulator
+        """
+        accumulator = cls(capacity=max(2 * len(results_dict), 1))
+        for animal_id, data in results_dict.items():
+            per_session: Dict[int, Dict[str, float]] = {}
+            for key, value in data.items():
+                metric, _, session = key.rpartition("_Session")
+                if metric and session.isdigit():
+                    per_session.setdefault(int(session), {})[metric] = value
+            for session, metrics in sorted(per_session.items()):
+                accumulator.append(animal_id, session, metrics)
+        return accumulator
+
+    def _paired(self) -> np.ndarray:
+        """
+        Pivot rows to an (n_animals, n_sessions, n_metrics) array.
+
+        When a session was appended more than once, its rows are merged metric
+        by metric: the latest non-NaN value wins, so a metric reported only by
+        an earlier row is kept, as ``dict.update`` did.
+        """
+        n = self._size
+        animals, sessions = self._animals[:n], self._sessions[:n].astype(np.int64) - SESSIONS[0]
+        keys = animals.astype(np.int64) * len(SESSIONS) + sessions
+        self.duplicates = n - len(np.unique(keys))
+
+        wide = np.full((len(self._animal_codes), len(SESSIONS), self._values.shape[1]), np.nan)
+        for code in range(self._values.shape[1]):
+            values = self._values[:n, code]
+            rows = np.flatnonzero(~np.isnan(values))
+            # np.unique keeps the first occurrence, so search the reversed rows
+            _, last = np.unique(keys[rows][::-1], return_index=True)
+            rows = rows[len(rows) - 1 - last]
+            wide[animals[rows], sessions[rows], code] = values[rows]
+
+        present = np.zeros((len(self._animal_codes), len(SESSIONS)), dtype=bool)
+        present[animals, sessions] = True
+        self._present = present
+
+        return wide
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Pair sessions per animal and compute the SIR columns.
+
+        Animals missing a session, or with a skipped session, are listed in
+        ``self.missing``; SIR columns of incomplete animals are NaN.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame indexed by Animal_ID, with SIZ and distance ratios added;
+            count metrics are ``Int64``, missing values being ``<NA>``.
+        """
+        wide = self._paired()
+        animal_ids = np.array(list(self._animal_codes), dtype=object)
+
+        def metric(name: str, session: int) -> np.ndarray:
+            code = self._metric_codes.get(name)
+            if code is None:
+                return np.full(len(animal_ids), np.nan)
+            return wide[:, session - SESSIONS[0], code]
+
+        time_1, time_2 = metric("Time_in_SIZ", 1), metric("Time_in_SIZ", 2)
+        dist_1, dist_2 = metric("Normalized_distance_to_POI", 1), metric("Normalized_distance_to_POI", 2)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sir = {
+                "Time_SIR_typeA": time_2 / time_1,
+                "Time_SIR_typeB": time_2 / (time_1 + time_2),
+                "Distance_SIR_typeA": dist_2 / dist_1,
+                "Distance_SIR_typeB": dist_2 / (dist_1 + dist_2),
+            }
+            sir["Social_Engagement_Index"] = sir["Time_SIR_typeB"] / sir["Distance_SIR_typeA"]
+
+        columns: Dict[str, Any] = {"Animal_ID": animal_ids}
+        for name in LEADING_METRICS:
+            for session in SESSIONS:
+                columns[f"{name}_Session{session}"] = metric(name, session)
+        for name in SIR_COLUMNS:
+            columns[name] = sir[name]
+        for name in TRAILING_METRICS:
+            for session in SESSIONS:
+                columns[f"{name}_Session{session}"] = metric(name, session)
+        for name in OPTIONAL_METRICS:
+            if name in self._metric_codes:
+                for session in SESSIONS:
+                    columns[f"{name}_Session{session}"] = metric(name, session)
+        for name in COUNT_METRICS:
+            for session in SESSIONS:
+                columns[f"{name}_Session{session}"] = pd.array(columns[f"{name}_Session{session}"], dtype="Int64")
+
+        skipped: Dict[str, List[str]] = {}
+        for animal_id, session in self.skipped:
+            skipped.setdefault(animal_id, []).append(f"Session{session}")
+
+        # Animals whose every row was skipped have no row in the frame
+        unseen = [animal_id for animal_id in skipped if animal_id not in self._animal_codes]
+        ids = list(animal_ids) + unseen
+        missing = np.vstack([~self._present, np.ones((len(unseen), len(SESSIONS)), dtype=bool)])
+        incomplete = [i for i, animal_id in enumerate(ids) if missing[i].any() or animal_id in skipped]
+        self.missing = pd.DataFrame({
+            "Animal_ID": [ids[i] for i in incomplete],
+            "Missing_sessions": [
+                ", ".join(f"Session{s}" for s, m in zip(SESSIONS, missing[i]) if m)
+                for i in incomplete
+            ],
+            "Skipped_sessions": [", ".join(skipped.get(ids[i], [])) for i in incomplete],
+        })
+
+        return pd.DataFrame(columns, index=pd.Index(animal_ids))
+
+    def report(self) -> Optional[str]:
+        """
+        One-line summary of skipped, duplicated and missing sessions from ``to_frame``.
+
+        Returns
+        -------
+        str or None
+            Summary, or None if every animal has exactly one row per session.
+        """
+        messages: List[str] = []
+        if self.skipped:
+            rows = "; ".join(f"{animal} (Session{session})" for animal, session in self.skipped)
+            messages.append(f"{len(self.skipped)} row(s) with a session other than {SESSIONS} skipped: {rows}")
+        if self.duplicates:
+            messages.append(f"{self.duplicates} duplicate session(s) merged, later values win")
+        incomplete = self.missing[self.missing["Missing_sessions"] != ""]
+        if len(incomplete):
+            animals = "; ".join(
+                f"{animal} ({sessions})"
+                for animal, sessions in zip(incomplete["Animal_ID"], incomplete["Missing_sessions"])
+            )
+            messages.append(f"{len(incomplete)} animal(s) missing a session: {animals}")
+        return ". ".join(messages) if messages else None
@@ -0,0 +1,742 @@
+"""
+Numerical equivalence harness between the reference SITAnalyzer pipeline
+(pandas masking and interpolation + matplotlib point-in-polygon) and the
+faster engines (fused kernel, online analyzer, distance fields and exact
+zone distances).
+
+Every engine runs on the same synthetic edge-case fixtures and, optionally,
+on a recorded DeepOF project. Each output column is compared with the
+reference within a stated tolerance, and the speedup is reported. In golden
+mode the reference outputs are written to, or checked against, a JSON file,
+and can be compared with a published summary such as
+Datas/Male_data_summary.csv.
+"""
+import argparse
+import json
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .analyzer import Experience, SITAnalyzer
+from .online import OnlineSITAnalyzer
+from .results import SESSIONS
+
+ARENA = [(40.0, 30.0), (40.0, 430.0), (440.0, 430.0), (440.0, 30.0)]
+SIZ = [(140.0, 30.0), (140.0, 150.0), (340.0, 150.0), (340.0, 30.0)]
+FPS = 30
+PX_SIZE = 0.1
+
+# Absolute tolerance per output column
+TOLERANCES: Dict[str, float] = {
+    "time_in_siz": 1e-9,
+    "distance_to_poi": 1e-6,
+    "normalized_distance_to_poi": 1e-9,
+    "total_distance": 1e-6,
+    "mean_speed": 1e-6,
+    "max_speed": 1e-6,
+    "time_immobile": 1e-9,
+    "immobility_bouts": 0,
+    "masked_fraction": 1e-12,
+    "distance_to_siz": 1e-6,
+    "distance_to_arena_edge": 1e-6,
+}
+
+# Distance fields are sampled on a 1 px grid
+FIELD_TOLERANCES: Dict[str, float] = {
+    "distance_to_poi": 0.5,
+    "normalized_distance_to_poi": 0.5 / 400,
+    "distance_to_siz": 0.5,
+    "distance_to_arena_edge": 0.5,
+}
+
+# Differences that are understood and accepted: (engine, fixture, column) -> reason
+KNOWN_DIFFERENCES: Dict[Tuple[str, str, str], str] = {
+    ("fused", "siz_edges", "time_in_siz"):
+        "matplotlib and the even-odd test break ties differently for points exactly on the SIZ boundary",
+    ("online", "siz_edges", "time_in_siz"):
+        "matplotlib and the even-odd test break ties differently for points exactly on the SIZ boundary",
+    ("fused", "nan_stretches", "total_distance"):
+        "reference sums NaN steps before the first detection to NaN; fused skips them",
+    ("fused", "all_nan", "total_distance"):
+        "reference sums NaN steps to NaN; fused reports 0",
+    ("online", "all_nan", "total_distance"):
+        "reference sums NaN steps to NaN; online reports 0",
+    ("online", "nan_stretches", "time_in_siz"):
+        "online forward-fills gaps, the reference interpolates linearly",
+    ("online", "nan_stretches", "distance_to_poi"):
+        "online forward-fills gaps, the reference interpolates linearly",
+    ("online", "nan_stretches", "normalized_distance_to_poi"):
+        "online forward-fills gaps, the reference interpolates linearly",
+    ("online", "nan_stretches", "total_distance"):
+        "reference sums NaN steps before the first detection to NaN; online skips them",
+    ("fused", "max_gap", "total_distance"):
+        "reference sums the NaN steps of gaps longer than max_gap to NaN; fused skips them",
+    ("online", "low_likelihood", "distance_to_poi"):
+        "online forward-fills masked points, the reference interpolates linearly",
+    ("online", "low_likelihood", "normalized_distance_to_poi"):
+        "online forward-fills masked points, the reference interpolates linearly",
+    ("online", "max_gap", "time_in_siz"):
+        "online forward-fills every gap, the reference interpolates and leaves gaps longer than max_gap",
+    ("online", "max_gap", "distance_to_poi"):
+        "online forward-fills every gap, the reference interpolates and leaves gaps longer than max_gap",
+    ("online", "max_gap", "normalized_distance_to_poi"):
+        "online forward-fills every gap, the reference interpolates and leaves gaps longer than max_gap",
+    ("online", "max_gap", "total_distance"):
+        "reference sums the NaN steps of gaps longer than max_gap to NaN; online skips them",
+}
+
+# Experience result column (without session suffix) -> fixture column it is
+# computed like, to apply TOLERANCES to a recorded project
+PROJECT_COLUMNS: Dict[str, str] = {
+    "Time_in_SIZ": "time_in_siz",
+    "Normalized_distance_to_POI": "normalized_distance_to_poi",
+    "Distance_to_POI": "distance_to_poi",
+    "Total_Distance_Traveled": "total_distance",
+    "Mean_speed": "mean_speed",
+    "Max_speed": "max_speed",
+    "Time_immobile": "time_immobile",
+    "Immobility_bouts": "immobility_bouts",
+}
+
+# SIR columns -> per-session metrics they are computed from
+DERIVED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "Time_SIR_typeA": ("Time_in_SIZ",),
+    "Time_SIR_typeB": ("Time_in_SIZ",),
+    "Distance_SIR_typeA": ("Normalized_distance_to_POI",),
+    "Distance_SIR_typeB": ("Normalized_distance_to_POI",),
+    "Social_Engagement_Index": ("Time_in_SIZ", "Normalized_distance_to_POI"),
+}
+
+# Tracked points landing exactly on the SIZ boundary are rare on real data
+SIZ_TIE_FRAMES = 3
+
+# Known differences on a recorded project, each with the per-animal condition
+# under which it is accepted: (engine, fixture column) -> (reason, check).
+# ``check(reference, value, fps)`` returns a boolean array; anything else fails.
+PROJECT_KNOWN_DIFFERENCES: Dict[Tuple[str, str], Tuple[str, Callable[[np.ndarray, np.ndarray, float], np.ndarray]]] = {
+    ("fused", "time_in_siz"): (
+        f"at most {SIZ_TIE_FRAMES} frames exactly on the SIZ boundary, where matplotlib and the even-odd test "
+        "break ties differently",
+        lambda reference, value, fps: np.abs(reference - value) <= SIZ_TIE_FRAMES / fps + 1e-9,
+    ),
+    ("fused", "total_distance"): (
+        "reference sums NaN steps to NaN; fused skips them",
+        lambda reference, value, fps: np.isnan(reference) & np.isfinite(value),
+    ),
+}
+
+# Feeding the online analyzer through a reused buffer must give the same results
+KNOWN_DIFFERENCES.update({
+    ("online_reused", fixture, column): reason
+    for (engine, fixture, column), reason in list(KNOWN_DIFFERENCES.items()) if engine == "online"
+})
+
+# Summary CSV column -> reference column, for golden comparisons
+PUBLISHED_COLUMNS: Dict[str, str] = {
+    "SEI": "Social_Engagement_Index",
+}
+
+
+def synthetic_fixtures(seed: int = 0) -> Dict[str, Dict[str, Any]]:
+    """
+    Edge-case inputs shared by every engine.
+
+    Parameters
+    ----------
+    seed : int, optional
+        Random seed. Default is 0.
+
+    Returns
+    -------
+    dict
+        Fixture name → {"center", "nose", "arena", "siz", "fps", "px_size"},
+        plus "center_likelihood", "nose_likelihood", "likelihood_threshold"
+        and "max_gap" for the masking and gap-limit fixtures.
+    """
+    rng = np.random.default_rng(seed)
+
+    def walk(n_frames: int) -> np.ndarray:
+        steps = rng.normal(0, 3, (n_frames, 2))
+        return np.clip(np.cumsum(steps, axis=0) + [240.0, 200.0], [41.0, 31.0], [439.0, 429.0])
+
+    def fixture(center: np.ndarray, nose: Optional[np.ndarray] = None, **options: Any) -> Dict[str, Any]:
+        nose = center + rng.normal(0, 2, center.shape) if nose is None else nose
+        return {"center": center, "nose": nose, "arena": ARENA, "siz": SIZ, "fps": FPS, "px_size": PX_SIZE, **options}
+
+    def likelihood(n_frames: int, low: List[slice]) -> np.ndarray:
+        values = rng.uniform(0.7, 1.0, n_frames)
+        for stretch in low:
+            values[stretch] = rng.uniform(0.0, 0.5, len(values[stretch]))
+        return values
+
+    # Points exactly on SIZ edges and corners, interleaved with interior points
+    (x0, y0), (x1, y1) = SIZ[0], SIZ[2]
+    t = np.linspace(0, 1, 50)
+    edges = np.vstack([
+        np.column_stack([x0 + t * (x1 - x0), np.full_like(t, y1)]),
+        np.column_stack([np.full_like(t, x0), y0 + t * (y1 - y0)]),
+        np.column_stack([np.full_like(t, x1), y0 + t * (y1 - y0)]),
+        np.array(SIZ, dtype=float),
+    ])
+    inside = np.column_stack([rng.uniform(x0 + 1, x1 - 1, len(edges)), rng.uniform(y0 + 1, y1 - 1, len(edges))])
+    on_edges = np.empty((2 * len(edges), 2))
+    on_edges[0::2], on_edges[1::2] = edges, inside
+
+    gaps = walk(3000)
+    gaps[:20] = np.nan
+    gaps[500:520] = np.nan
+    gaps[1200:1800] = np.nan
+    gaps[-15:] = np.nan
+
+    # Gaps shorter than, equal to and longer than max_gap, at both ends too
+    limited = walk(6000)
+    for stretch in (slice(0, 12), slice(300, 303), slice(900, 930), slice(1500, 1531), slice(2500, 2700), slice(-40, None)):
+        limited[stretch] = np.nan
+
+    # Immobile for 10 s, then a slow drift that stays inside the arena
+    stationary = np.repeat([[240.0, 300.0]], 600, axis=0)
+    stationary[300:, 0] += np.cumsum(np.full(300, 0.5))
+
+    return {
+        "random_walk": fixture(walk(9000)),
+        "siz_edges": fixture(on_edges, on_edges),
+        "nan_stretches": fixture(gaps),
+        "all_nan": fixture(np.full((300, 2), np.nan)),
+        "single_frame": fixture(np.array([[200.0, 100.0]])),
+        "stationary": fixture(stationary),
+        "low_likelihood": fixture(
+            walk(6000),
+            center_likelihood=likelihood(6000, [slice(100, 105), slice(1000, 1040), slice(3000, 3300)]),
+            nose_likelihood=likelihood(6000, [slice(2000, 2010), slice(4000, 4200)]),
+            likelihood_threshold=0.6,
+        ),
+        "max_gap": fixture(
+            limited,
+            center_likelihood=likelihood(6000, [slice(4000, 4020), slice(5000, 5100)]),
+            nose_likelihood=likelihood(6000, [slice(4500, 4510)]),
+            likelihood_threshold=0.6,
+            max_gap=30,
+        ),
+    }
+
+
+def reference_locomotion(
+    center: pd.DataFrame,
+    px_size: float,
+    fps: float,
+    speed_window: float = 1.0,
+    immobility_speed: float = 2.0,
+    min_immobility_bout: float = 1.0) -> Dict[str, float]:
+    """
+    Speed and immobility written independently of ``locomotion_profile``.
+
+    The speed is smoothed with pandas ``rolling(center=True, min_periods=1)``
+    and immobility bouts are counted frame by frame, so the fused engine is
+    not checked against its own code.
+    """
+    steps = np.sqrt((center.diff().iloc[1:] ** 2).sum(axis=1, min_count=2))
+    window = max(int(round(speed_window * fps)), 1)
+    speed = (steps * px_size * fps).rolling(window, center=True, min_periods=1).mean()
+    if speed.isna().all():
+        return {"mean_speed": float("nan"), "max_speed": float("nan"), "time_immobile": 0.0, "immobility_bouts": 0}
+
+    min_frames = max(int(round(min_immobility_bout * fps)), 1)
+    lengths, run = [], 0
+    for value in list(speed) + [float("nan")]:
+        if value < immobility_speed:
+            run += 1
+            continue
+        if run >= min_frames:
+            lengths.append(run)
+        run = 0
+
+    return {
+        "mean_speed": float(speed.mean()),
+        "max_speed": float(speed.max()),
+        "time_immobile": sum(lengths) / fps,
+        "immobility_bouts": len(lengths),
+    }
+
+
+def reference_points(fixture: Dict[str, Any], part: str) -> pd.DataFrame:
+    """
+    Mask, interpolate and gap-limit one body part with pandas.
+
+    Points whose likelihood is under the fixture's threshold are masked,
+    ``DataFrame.interpolate`` fills every gap, and gaps longer than
+    ``max_gap`` frames are blanked again, found by their run length.
+    """
+    points = pd.DataFrame(fixture[part])
+    likelihood = fixture.get(f"{part}_likelihood")
+    if fixture.get("likelihood_threshold") is not None and likelihood is not None:
+        points.loc[likelihood < fixture["likelihood_threshold"]] = np.nan
+
+    filled = Experience._interpolate(points)
+    if fixture.get("max_gap") is not None:
+        filled = filled.copy()
+        for column in points:
+            missing = points[column].isna()
+            run_length = missing.groupby((~missing).cumsum()).transform("sum")
+            filled.loc[missing & (run_length > fixture["max_gap"]), column] = np.nan
+    return filled
+
+
+def reference_masked_fraction(fixture: Dict[str, Any]) -> float:
+    """Share of frames where any body part is under the likelihood threshold."""
+    threshold = fixture.get("likelihood_threshold")
+    low = [
+        pd.Series(fixture[f"{part}_likelihood"]) < threshold
+        for part in ("center", "nose") if fixture.get(f"{part}_likelihood") is not None
+    ]
+    if threshold is None or not low or not len(fixture["center"]):
+        return 0.0
+    return float(pd.concat(low, axis=1).any(axis=1).mean())
+
+
+def reference_zone_distance(points: pd.DataFrame, vertices: np.ndarray) -> pd.Series:
+    """
+    Exact signed distance to a polygon, negative inside, without a grid.
+
+    Every point is projected on every edge at once by broadcasting, and the
+    inside test uses matplotlib, like ``SITAnalyzer.time_in_SIZ``.
+    """
+    import matplotlib.path as mpath
+
+    xy = points.to_numpy(dtype=float)
+    start = np.asarray(vertices, dtype=float)
+    edge = np.roll(start, -1, axis=0) - start
+    offset = xy[:, None, :] - start[None]
+    t = np.clip((offset * edge).sum(axis=2) / (edge ** 2).sum(axis=1), 0.0, 1.0)
+    distance = np.linalg.norm(offset - t[..., None] * edge, axis=2).min(axis=1)
+    inside = mpath.Path(start).contains_points(np.nan_to_num(xy, nan=np.inf))
+    return pd.Series(np.where(inside, -distance, distance), index=points.index)
+
+
+def reference_engine(fixture: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Original pipeline: pandas masking and interpolation, the SITAnalyzer
+    methods, ``reference_locomotion`` and ``reference_zone_distance``.
+    """
+    sit = SITAnalyzer(fixture["arena"], fixture["siz"], fps=fixture["fps"])
+    center = reference_points(fixture, "center")
+    nose = reference_points(fixture, "nose")
+
+    dist, normalized = sit.distance_to_poi(nose)
+    metrics = {
+        "time_in_siz": sit.time_in_SIZ(center),
+        "distance_to_poi": dist.mean(),
+        "normalized_distance_to_poi": normalized.mean(),
+        "total_distance": sit.total_distance_traveled(center, fixture["px_size"]),
+        "masked_fraction": reference_masked_fraction(fixture),
+        "distance_to_siz": reference_zone_distance(center, sit.siz_vertices).mean(),
+        "distance_to_arena_edge": -reference_zone_distance(center, sit.arena_vertices).mean(),
+    }
+    metrics.update(reference_locomotion(center, fixture["px_size"], fixture["fps"]))
+    return metrics
+
+
+def fused_engine(fixture: Dict[str, Any]) -> Dict[str, float]:
+    """Single-pass NumPy kernel, with likelihood masking, gap limit and exact zone distances."""
+    sit = SITAnalyzer(fixture["arena"], fixture["siz"], fps=fixture["fps"])
+    return sit.fused_metrics(
+        fixture["center"], fixture["nose"], fixture["px_size"],
+        center_likelihood=fixture.get("center_likelihood"),
+        nose_likelihood=fixture.get("nose_likelihood"),
+        likelihood_threshold=fixture.get("likelihood_threshold"),
+        max_gap=fixture.get("max_gap"),
+        distance_fields=sit.exact_distances(),
+    )
+
+
+def online_engine(fixture: Dict[str, Any], batch_size: int = 32, reuse_buffer: bool = False) -> Dict[str, float]:
+    """
+    Streaming analyzer fed in small batches, optionally through one reused buffer like a live feed.
+
+    Low-likelihood points are sent as NaN, as a live reader would; ``max_gap``
+    has no online counterpart.
+    """
+    online = OnlineSITAnalyzer(fixture["arena"], fixture["siz"], fps=fixture["fps"], px_size=fixture["px_size"])
+    points = {}
+    for part in ("center", "nose"):
+        points[part] = np.array(fixture[part], dtype=float)
+        likelihood = fixture.get(f"{part}_likelihood")
+        if fixture.get("likelihood_threshold") is not None and likelihood is not None:
+            points[part][likelihood < fixture["likelihood_threshold"]] = np.nan
+
+    center_buffer, nose_buffer = np.empty((batch_size, 2)), np.empty((batch_size, 2))
+    for start in range(0, len(points["center"]), batch_size):
+        center = points["center"][start:start + batch_size]
+        nose = points["nose"][start:start + batch_size]
+        if reuse_buffer:
+            center_buffer[:len(center)], nose_buffer[:len(nose)] = center, nose
+            center, nose = center_buffer[:len(center)], nose_buffer[:len(nose)]
+        online.push(center, nose)
+    snapshot = online.snapshot()
+    return {k: snapshot[k] for k in ("time_in_siz", "distance_to_poi", "normalized_distance_to_poi", "total_distance")}
+
+
+def _nanmean(values: np.ndarray) -> float:
+    finite = np.isfinite(values)
+    return float(values[finite].mean()) if finite.any() else float("nan")
+
+
+def distance_field_engine(fixture: Dict[str, Any]) -> Dict[str, float]:
+    """
+    POI, SIZ and arena-edge distances looked up in distance fields.
+
+    The fields are built on every call, so the timing includes the build,
+    as for a video whose geometry no other video shares.
+    """
+    sit = SITAnalyzer(fixture["arena"], fixture["siz"], fps=fixture["fps"])
+    center = reference_points(fixture, "center").to_numpy(dtype=float)
+    nose = reference_points(fixture, "nose").to_numpy(dtype=float)
+    fields = sit.distance_fields()
+    mean_dist = _nanmean(fields["poi"].lookup(nose))
+    max_dist = float(np.linalg.norm(sit.POI - np.array(sit.bottom_left_arena)))
+    return {
+        "distance_to_poi": mean_dist,
+        "normalized_distance_to_poi": mean_dist / max_dist,
+        "distance_to_siz": _nanmean(fields["siz"].lookup(center)),
+        "distance_to_arena_edge": -_nanmean(fields["arena"].lookup(center)),
+    }
+
+
+def exact_distance_engine(fixture: Dict[str, Any]) -> Dict[str, float]:
+    """SIZ and arena-edge distances from ``SITAnalyzer.exact_distances``, the speed baseline of the fields."""
+    sit = SITAnalyzer(fixture["arena"], fixture["siz"], fps=fixture["fps"])
+    center = reference_points(fixture, "center").to_numpy(dtype=float)
+    distances = sit.exact_distances()
+    return {
+        "distance_to_siz": _nanmean(distances["siz"].lookup(center)),
+        "distance_to_arena_edge": -_nanmean(distances["arena"].lookup(center)),
+    }
+
+
+ENGINES: Dict[str, Tuple[Callable[[Dict[str, Any]], Dict[str, float]], Dict[str, float]]] = {
+    "fused": (fused_engine, TOLERANCES),
+    "online": (online_engine, TOLERANCES),
+    "online_reused": (partial(online_engine, reuse_buffer=True), TOLERANCES),
+    "distance_field": (distance_field_engine, FIELD_TOLERANCES),
+    "exact_distance": (exact_distance_engine, TOLERANCES),
+}
+
+
+def _abs_error(reference: float, value: float) -> float:
+    if np.isnan(reference) and np.isnan(value):
+        return 0.0
+    if np.isnan(reference) or np.isnan(value):
+        return float("inf")
+    return abs(float(reference) - float(value))
+
+
+def _timed(function: Callable[..., Any], *args: Any, repeats: int = 3) -> Tuple[Any, float]:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def compare_engines(
+    fixtures: Dict[str, Dict[str, Any]],
+    engines: Optional[List[str]] = None,
+    repeats: int = 3) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Run the reference and the accelerated engines on every fixture.
+
+    Parameters
+    ----------
+    fixtures : dict
+        Fixture name → inputs, as returned by ``synthetic_fixtures``.
+    engines : list of str, optional
+        Engines to check. Default is every engine in ``ENGINES``.
+    repeats : int, optional
+        Timing repeats; the best run is kept. Default is 3.
+
+    Returns
+    -------
+    tuple of pd.DataFrame
+        Per (engine, fixture, column) errors with their status, and per
+        engine total time and speedup over the reference.
+    """
+    engines = list(ENGINES) if engines is None else engines
+    rows = []
+    timings = {name: 0.0 for name in ["reference"] + engines}
+
+    for fixture_name, fixture in fixtures.items():
+        reference, elapsed = _timed(reference_engine, fixture, repeats=repeats)
+        timings["reference"] += elapsed
+
+        for engine in engines:
+            function, tolerances = ENGINES[engine]
+            result, elapsed = _timed(function, fixture, repeats=repeats)
+            timings[engine] += elapsed
+
+            for column, tolerance in tolerances.items():
+                if column not in result:
+                    continue
+                error = _abs_error(reference[column], result[column])
+                known = KNOWN_DIFFERENCES.get((engine, fixture_name, column))
+                status = "ok" if error <= tolerance else ("known" if known else "FAIL")
+                rows.append({
+                    "engine": engine, "fixture": fixture_name, "column": column,
+                    "reference": reference[column], "value": result[column],
+                    "abs_error": error, "tolerance": tolerance, "status": status,
+                    "note": known if status == "known" else "",
+                })
+
+    speed = pd.DataFrame({
+        "engine": engines,
+        "seconds": [timings[e] for e in engines],
+        "speedup": [timings["reference"] / timings[e] if timings[e] else float("inf") for e in engines],
+    })
+    return pd.DataFrame(rows), speed
+
+
+def compare_project(
+    project_path: str,
+    conditions_path: str,
+    arena_path: str,
+    SIZ_path: str,
+    fps: float = 30,
+    PX_SIZE: float = 0.1) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, float]:
+    """
+    Run the reference and fused pipelines of ``Experience`` on a recorded project.
+
+    Both pipelines share ``SITAnalyzer.locomotion``; the locomotion columns
+    are checked independently on the synthetic fixtures.
+
+    Returns
+    -------
+    tuple
+        Reference results, fused results, per-column errors with their status
+        (see ``project_status``) and the fused speedup.
+    """
+    start = time.perf_counter()
+    reference = Experience(project_path, conditions_path, arena_path, SIZ_path, fps, PX_SIZE).run_all()
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fused = Experience(project_path, conditions_path, arena_path, SIZ_path, fps, PX_SIZE, fused=True).run_all()
+    fused_time = time.perf_counter() - start
+
+    errors = project_status(reference, fused, "fused", fps)
+    return reference, fused, errors, reference_time / fused_time
+
+
+def column_errors(reference: pd.DataFrame, other: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-column max absolute error between two results tables on shared animals.
+
+    Parameters
+    ----------
+    reference, other : pd.DataFrame
+        Results indexed by Animal_ID.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``column``, ``max_abs_error`` and ``n_animals``, one row per shared
+        numeric column.
+    """
+    animals = reference.index.intersection(other.index)
+    rows = []
+    for column in reference.columns.intersection(other.columns):
+        ref = pd.to_numeric(reference.loc[animals, column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        val = pd.to_numeric(other.loc[animals, column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        if np.isnan(ref).all() and np.isnan(val).all():
+            continue
+        errors = [_abs_error(r, v) for r, v in zip(ref, val)]
+        rows.append({"column": column, "max_abs_error": max(errors, default=0.0), "n_animals": len(animals)})
+    return pd.DataFrame(rows, columns=["column", "max_abs_error", "n_animals"])
+
+
+def project_status(
+    reference: pd.DataFrame,
+    other: pd.DataFrame,
+    engine: str,
+    fps: float) -> pd.DataFrame:
+    """
+    Per-column errors between two results tables, classified animal by animal.
+
+    An animal's error beyond ``TOLERANCES`` is "known" only if the condition
+    of the matching ``PROJECT_KNOWN_DIFFERENCES`` entry holds for it. An SIR
+    column may differ only for animals whose input metrics differ in a known
+    way and none fail. Any other error beyond tolerance is a FAIL.
+
+    Parameters
+    ----------
+    reference, other : pd.DataFrame
+        Results indexed by Animal_ID.
+    engine : str
+        Engine that produced ``other``.
+    fps : float
+        Frame rate of the project, to bound boundary ties.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``column``, ``max_abs_error``, ``n_animals``, ``n_known``,
+        ``tolerance``, ``status`` (ok, known or FAIL) and ``note``, one row
+        per shared numeric column.
+    """
+    animals = reference.index.intersection(other.index)
+    known: Dict[str, np.ndarray] = {}
+    failed: Dict[str, np.ndarray] = {}
+    rows = []
+
+    # Per-session metrics first, so the SIR columns can look at their inputs
+    columns = sorted(reference.columns.intersection(other.columns), key=lambda c: c in DERIVED_COLUMNS)
+    for column in columns:
+        ref = pd.to_numeric(reference.loc[animals, column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        val = pd.to_numeric(other.loc[animals, column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        if np.isnan(ref).all() and np.isnan(val).all():
+            continue
+
+        errors = np.array([_abs_error(r, v) for r, v in zip(ref, val)])
+        metric, _, session = column.rpartition("_Session")
+        metric = metric if session.isdigit() else column
+        source = PROJECT_COLUMNS.get(metric)
+        tolerance = TOLERANCES.get(source, 1e-6)
+        ok = errors <= tolerance
+        accepted = np.zeros(len(ok), dtype=bool)
+        note = ""
+
+        if (engine, source) in PROJECT_KNOWN_DIFFERENCES:
+            note, check = PROJECT_KNOWN_DIFFERENCES[engine, source]
+            accepted = ~ok & check(ref, val, fps)
+        elif metric in DERIVED_COLUMNS:
+            inputs = [f"{name}_Session{s}" for name in DERIVED_COLUMNS[metric] for s in SESSIONS]
+            inputs = [name for name in inputs if name in known]
+            if inputs:
+                input_known = np.any([known[name] for name in inputs], axis=0)
+                input_failed = np.any([failed[name] for name in inputs], axis=0)
+                accepted = ~ok & input_known & ~input_failed
+                note = f"follows known differences in {', '.join(DERIVED_COLUMNS[metric])}"
+
+        known[column], failed[column] = accepted, ~ok & ~accepted
+        status = "ok" if ok.all() else ("FAIL" if failed[column].any() else "known")
+        rows.append({
+            "column": column, "max_abs_error": errors.max(initial=0.0), "n_animals": len(animals),
+            "n_known": int(accepted.sum()), "tolerance": tolerance, "status": status,
+            "note": note if status == "known" else "",
+        })
+
+    columns = ["column", "max_abs_error", "n_animals", "n_known", "tolerance", "status", "note"]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def write_golden(fixtures: Dict[str, Dict[str, Any]], path: str) -> None:
+    """
+    Save the reference outputs of every fixture to a JSON file.
+
+    Parameters
+    ----------
+    fixtures : dict
+        Fixture name → inputs.
+    path : str
+        Output JSON path.
+    """
+    golden = {name: reference_engine(fixture) for name, fixture in fixtures.items()}
+    with open(path, "w") as f:
+        json.dump(golden, f, indent=2, default=float)
+
+
+def check_golden(fixtures: Dict[str, Dict[str, Any]], path: str) -> pd.DataFrame:
+    """
+    Compare the current reference outputs with a saved golden file.
+
+    Parameters
+    ----------
+    fixtures : dict
+        Fixture name → inputs; must be generated with the same seed.
+    path : str
+        Golden JSON path written by ``write_golden``.
+
+    Returns
+    -------
+    pd.DataFrame
+        Per (fixture, column) error and status.
+    """
+    with open(path) as f:
+        golden = json.load(f)
+
+    rows = []
+    for name, expected in golden.items():
+        current = reference_engine(fixtures[name])
+        for column, value in expected.items():
+            error = _abs_error(float(value), float(current[column]))
+            tolerance = TOLERANCES.get(column, 1e-9)
+            rows.append({
+                "fixture": name, "column": column, "golden": value, "current": current[column],
+                "abs_error": error, "status": "ok" if error <= tolerance else "FAIL",
+            })
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check fast engines against the reference SITAnalyzer.")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--write_golden", default=None, help="Save reference outputs to this JSON file")
+    parser.add_argument("--check_golden", default=None, help="Compare reference outputs with this JSON file")
+    parser.add_argument("--project_path", default=None, help="Also compare on a recorded DeepOF project")
+    parser.add_argument("--conditions_path", default=None)
+    parser.add_argument("--arena_path", default=None)
+    parser.add_argument("--siz_path", default=None)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--px_size", type=float, default=0.1)
+    parser.add_argument("--summary", default=None,
+                        help="Published summary CSV (e.g. Datas/Male_data_summary.csv) to check the project against")
+    parser.add_argument("--summary_tolerance", type=float, default=5e-4,
+                        help="Tolerance against the published summary, which is rounded to 3 decimals")
+    args = parser.parse_args()
+
+    pd.set_option("display.width", 200)
+    pd.set_option("display.max_rows", 500)
+    fixtures = synthetic_fixtures(args.seed)
+    failed = False
+
+    if args.write_golden:
+        write_golden(fixtures, args.write_golden)
+        print(f"Saved golden reference outputs to {args.write_golden}")
+
+    if args.check_golden:
+        golden = check_golden(fixtures, args.check_golden)
+        print(golden.to_string(index=False))
+        failed |= (golden["status"] == "FAIL").any()
+
+    errors, speed = compare_engines(fixtures, args.engines, args.repeats)
+    print(errors.to_string(index=False))
+    print()
+    print(errors.groupby(["engine", "column"])["abs_error"].max().rename("max_abs_error").to_string())
+    print()
+    print(speed.to_string(index=False))
+    failed |= (errors["status"] == "FAIL").any()
+
+    if args.project_path:
+        reference, fused, project_errors, speedup = compare_project(
+            args.project_path, args.conditions_path, args.arena_path, args.siz_path, args.fps, args.px_size
+        )
+        print(f"\nRecorded project, fused vs reference (speedup {speedup:.1f}x):")
+        print(project_errors.to_string(index=False))
+        failed |= (project_errors["status"] == "FAIL").any()
+
+        if args.summary:
+            published = pd.read_csv(args.summary, index_col="Animal_ID").rename(columns=PUBLISHED_COLUMNS)
+            summary_errors = column_errors(published, reference)
+            print(f"\nReference vs {args.summary}:")
+            print(summary_errors.to_string(index=False))
+            failed |= (summary_errors["max_abs_error"] > args.summary_tolerance).any()
+
+    if failed:
+        raise SystemExit("Engines differ from the reference beyond tolerance")
+
+
+if __name__ == "__main__":
+    main()